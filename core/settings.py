@@ -188,10 +188,32 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Persistent connections; polling endpoints reuse them instead of reconnecting
+        # (the 'pool' option is PostgreSQL-only and not available for SQLite)
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 
+# Cache - LocMem (Development) / Redis (Production)
+# Production'da birden fazla worker process çalışır; cache invalidation'ın (ör. ServiceConfiguration)
+# ve Celery task'larının yazdığı verilerin tüm process'lerde görünmesi için paylaşılan cache gerekir
+if DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_CACHE_URL', 'redis://localhost:6379/1'),
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
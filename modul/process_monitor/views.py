@@ -77,7 +77,7 @@ def log_process_monitor_request(func):
                 'kwargs': str(kwargs) if kwargs else None
             }
             
-            pm_logger.info(f"REQUEST | {user} | {method} {endpoint} | {json.dumps(log_data, ensure_ascii=False)}")
+            pm_logger.info("REQUEST | %s | %s %s | %s", user, method, endpoint, json.dumps(log_data, ensure_ascii=False))
             
             # Execute function
             try:
@@ -89,14 +89,14 @@ def log_process_monitor_request(func):
                         response_data = json.loads(response.content.decode('utf-8'))
                         success = response_data.get('success', False)
                         status = 'SUCCESS' if success else 'FAILED'
-                        pm_logger.info(f"RESPONSE | {user} | {status} | {method} {endpoint}")
+                        pm_logger.info("RESPONSE | %s | %s | %s %s", user, status, method, endpoint)
                     except:
-                        pm_logger.info(f"RESPONSE | {user} | {method} {endpoint}")
+                        pm_logger.info("RESPONSE | %s | %s %s", user, method, endpoint)
                 
                 return response
                 
             except Exception as e:
-                pm_logger.error(f"ERROR | {user} | {method} {endpoint} | {str(e)}")
+                pm_logger.error("ERROR | %s | %s %s | %s", user, method, endpoint, e)
                 raise
         else:
             # If logging disabled, just execute function
@@ -105,6 +105,21 @@ def log_process_monitor_request(func):
     return wrapper
 
 
+def admin_json_required(view_func):
+    """Decorator to restrict JSON API views to superusers"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        # Sadece superuser erişebilir
+        if not request.user.is_superuser:
+            return JsonResponse({
+                'success': False,
+                'error': 'Unauthorized: Admin access required'
+            }, status=403)
+        return view_func(request, *args, **kwargs)
+    
+    return wrapper
+
+
 @login_required
 def process_monitor_view(request):
     """Process Monitor ana sayfası (Cache-First Loading)"""
@@ -147,7 +162,7 @@ def process_monitor_view(request):
             'live_mode_enabled': settings.live_mode_enabled
         })
     except Exception as e:
-        logger.error(f"❌ Process monitor sayfası yüklenirken hata: {str(e)}")
+        logger.error("❌ Process monitor sayfası yüklenirken hata: %s", e)
         import json
         return render(request, 'modules/process_monitor/index.html', {
             'error': str(e),
@@ -179,7 +194,7 @@ def get_connections_api(request):
             'cached': connections is not None
         })
     except Exception as e:
-        logger.error(f"Bağlantılar alınırken hata: {str(e)}")
+        logger.error("Bağlantılar alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -196,7 +211,7 @@ def get_grouped_processes_api(request):
             'processes': processes
         })
     except Exception as e:
-        logger.error(f"Gruplu süreçler alınırken hata: {str(e)}")
+        logger.error("Gruplu süreçler alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -232,7 +247,7 @@ def get_pid_grouped_processes_api(request):
         })
         
     except Exception as e:
-        logger.error(f"PID'e göre süreçler alınırken hata: {str(e)}")
+        logger.error("PID'e göre süreçler alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -249,7 +264,7 @@ def get_interfaces_api(request):
             'interfaces': interfaces
         })
     except Exception as e:
-        logger.error(f"Arayüzlere göre süreçler alınırken hata: {str(e)}")
+        logger.error("Arayüzlere göre süreçler alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -281,7 +296,7 @@ def get_most_used_ports_api(request):
         # Limit'e göre filtrele (çok büyük limitler için tümünü döndür)
         # Eğer limit 1000'den büyükse, cache'ten gelen verileri kullanma, gerçek zamanlı çek
         if limit >= 1000:
-            logger.info(f"Large limit requested ({limit}), fetching real-time data...")
+            logger.info("Large limit requested (%s), fetching real-time data...", limit)
             ports = process_monitor.get_most_used_ports(limit=limit)
         elif ports and len(ports) > limit:
             ports = ports[:limit]
@@ -293,7 +308,7 @@ def get_most_used_ports_api(request):
             'total_ports': len(ports) if ports else 0
         })
     except Exception as e:
-        logger.error(f"Portlar alınırken hata: {str(e)}")
+        logger.error("Portlar alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -316,7 +331,7 @@ def get_port_details_api(request, port):
                 'message': 'Port bilgisi bulunamadı'
             }, status=404)
     except Exception as e:
-        logger.error(f"Port detayları alınırken hata: {str(e)}")
+        logger.error("Port detayları alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'message': str(e)
@@ -339,7 +354,7 @@ def get_process_details_api(request, pid):
                 'message': 'Süreç bulunamadı'
             }, status=404)
     except Exception as e:
-        logger.error(f"Süreç detayları alınırken hata: {str(e)}")
+        logger.error("Süreç detayları alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'message': str(e)
@@ -380,7 +395,7 @@ def manage_process_api(request, pid, action):
             'message': 'Geçersiz PID'
         }, status=400)
     except Exception as e:
-        logger.error(f"Süreç yönetimi sırasında hata: {str(e)}")
+        logger.error("Süreç yönetimi sırasında hata: %s", e)
         return JsonResponse({
             'success': False,
             'message': str(e)
@@ -392,15 +407,9 @@ def manage_process_api(request, pid, action):
 # ========================
 
 @login_required
+@admin_json_required
 def get_service_status_api(request):
     """Live mode ve background service durumunu getir (Admin-only)"""
-    # Sadece superuser erişebilir
-    if not request.user.is_superuser:
-        return JsonResponse({
-            'success': False,
-            'error': 'Unauthorized: Admin access required'
-        }, status=403)
-    
     try:
         settings = ProcessMonitorSettings.get_global_settings()
         
@@ -423,7 +432,7 @@ def get_service_status_api(request):
             }
         })
     except Exception as e:
-        logger.error(f"Service status alınırken hata: {str(e)}")
+        logger.error("Service status alınırken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -433,15 +442,9 @@ def get_service_status_api(request):
 @login_required
 @require_http_methods(["POST"])
 @log_process_monitor_request
+@admin_json_required
 def toggle_live_mode_api(request):
     """Live mode'u aç/kapa (Admin-only, Global)"""
-    # Sadece superuser erişebilir
-    if not request.user.is_superuser:
-        return JsonResponse({
-            'success': False,
-            'error': 'Unauthorized: Admin access required'
-        }, status=403)
-    
     try:
         import json
         data = json.loads(request.body)
@@ -458,9 +461,9 @@ def toggle_live_mode_api(request):
         if enabled:
             from .tasks import update_process_monitor_cache
             update_process_monitor_cache.delay()
-            logger.info(f"✓ Live mode ENABLED: {request.user.username} (Global)")
+            logger.info("✓ Live mode ENABLED: %s (Global)", request.user.username)
         else:
-            logger.info(f"✗ Live mode DISABLED: {request.user.username} (Global)")
+            logger.info("✗ Live mode DISABLED: %s (Global)", request.user.username)
         
         return JsonResponse({
             'success': True,
@@ -468,7 +471,7 @@ def toggle_live_mode_api(request):
             'message': f'Live mode {"enabled" if enabled else "disabled"} (Global for all admins)'
         })
     except Exception as e:
-        logger.error(f"Live mode toggle hatası: {str(e)}")
+        logger.error("Live mode toggle hatası: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -478,15 +481,9 @@ def toggle_live_mode_api(request):
 @login_required
 @require_http_methods(["POST"])
 @log_process_monitor_request
+@admin_json_required
 def update_monitoring_settings_api(request):
     """Monitoring ayarlarını güncelle (Admin-only, Global)"""
-    # Sadece superuser erişebilir
-    if not request.user.is_superuser:
-        return JsonResponse({
-            'success': False,
-            'error': 'Unauthorized: Admin access required'
-        }, status=403)
-    
     try:
         import json
         data = json.loads(request.body)
@@ -529,7 +526,7 @@ def update_monitoring_settings_api(request):
         # Celery Beat'i yeniden başlat (interval değiştiğinde)
         # NOT: Bu otomatik olarak celerybeat-schedule dosyasından okunur
         
-        logger.info(f"⚙️ Ayarlar güncellendi: {request.user.username} | Interval: {settings.monitoring_interval}s")
+        logger.info("⚙️ Ayarlar güncellendi: %s | Interval: %ss", request.user.username, settings.monitoring_interval)
         
         return JsonResponse({
             'success': True,
@@ -541,7 +538,7 @@ def update_monitoring_settings_api(request):
             }
         })
     except Exception as e:
-        logger.error(f"Ayarlar güncellenirken hata: {str(e)}")
+        logger.error("Ayarlar güncellenirken hata: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -562,7 +559,7 @@ def force_cache_update_api(request):
             'task_id': task.id
         })
     except Exception as e:
-        logger.error(f"Cache güncelleme hatası: {str(e)}")
+        logger.error("Cache güncelleme hatası: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -622,7 +619,7 @@ def search_connections_api(request):
         })
         
     except Exception as e:
-        logger.error(f"Connection search error: {str(e)}")
+        logger.error("Connection search error: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -680,12 +677,12 @@ def download_search_report(request):
         )
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
-        logger.info(f"PDF Report downloaded: {filename} by {request.user.username} (Type: {report_type})")
+        logger.info("PDF Report downloaded: %s by %s (Type: %s)", filename, request.user.username, report_type)
         
         return response
         
     except Exception as e:
-        logger.error(f"PDF Report generation error: {str(e)}")
+        logger.error("PDF Report generation error: %s", e)
         return JsonResponse({
             'success': False,
             'error': str(e)
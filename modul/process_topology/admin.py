@@ -16,7 +16,7 @@ class ProcessNodeAdmin(admin.ModelAdmin):
     list_display = ['name', 'pid', 'status', 'user', 'cpu_percent', 'memory_percent', 'topology']
     list_filter = ['status', 'user', 'topology', 'created_at']
     search_fields = ['name', 'pid', 'user']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['status_color', 'cpu_color', 'memory_color', 'created_at', 'updated_at']
     ordering = ['-created_at']
     
     fieldsets = (
@@ -30,7 +30,7 @@ class ProcessNodeAdmin(admin.ModelAdmin):
             'fields': ('create_time', 'start_time', 'parent_pid', 'command_line', 'working_directory')
         }),
         ('Graph Pozisyonu', {
-            'fields': ('x_position', 'y_position', 'node_size', 'node_color')
+            'fields': ('x_position', 'y_position', 'node_size', 'node_color', 'status_color', 'cpu_color', 'memory_color')
         }),
         ('Metadata', {
             'fields': ('environment', 'created_at', 'updated_at'),
@@ -1,8 +1,21 @@
 from django.db import models
+from django.contrib.postgres.indexes import BrinIndex
 from django.utils import timezone
 import json
 
 
+class TimestampBrinIndex(BrinIndex):
+    """
+    Zaman serisi kolonları için BRIN index - PostgreSQL dışındaki veritabanlarında
+    (ör. SQLite) normal B-tree index olarak oluşturulur
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return models.Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
 class ProcessTopology(models.Model):
     """
     Süreç topolojisi ana modeli - sistem süreçlerinin genel durumunu tutar
@@ -63,6 +76,11 @@ class ProcessNode(models.Model):
     node_size = models.FloatField(default=1.0, verbose_name="Düğüm Boyutu")
     node_color = models.CharField(max_length=7, default="#007bff", verbose_name="Düğüm Rengi")
     
+    # Render renkleri (save() sırasında hesaplanır)
+    status_color = models.CharField(max_length=7, default="#6c757d", verbose_name="Durum Rengi")
+    cpu_color = models.CharField(max_length=7, default="#28a745", verbose_name="CPU Rengi")
+    memory_color = models.CharField(max_length=7, default="#28a745", verbose_name="Bellek Rengi")
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Kayıt Tarihi")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
@@ -81,6 +99,18 @@ class ProcessNode(models.Model):
     def __str__(self):
         return f"{self.name} (PID: {self.pid})"
     
+    def save(self, *args, **kwargs):
+        """Render renklerini kaydetmeden önce hesaplar"""
+        self.status_color = self.get_status_display_color()
+        self.cpu_color = self.get_cpu_color()
+        self.memory_color = self.get_memory_color()
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'status_color', 'cpu_color', 'memory_color'}
+        
+        super().save(*args, **kwargs)
+    
     def get_status_display_color(self):
         """Durum rengini döndürür"""
         status_colors = {
@@ -260,7 +290,7 @@ class ProcessEvent(models.Model):
             models.Index(fields=['topology', 'event_type']),
             models.Index(fields=['node', 'timestamp']),
             models.Index(fields=['severity']),
-            models.Index(fields=['timestamp']),
+            TimestampBrinIndex(fields=['timestamp'], name='pe_ts_brin'),
         ]
     
     def __str__(self):
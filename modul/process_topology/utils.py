@@ -1,17 +1,226 @@
 import psutil
 import os
 import platform
+import pwd
 import subprocess
 import json
 import time
 import logging
 from datetime import datetime, timezone
+from functools import cached_property, lru_cache
 from typing import List, Dict, Any, Optional
 import socket
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+# Optional fast JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Süreç durumuna göre düğüm renkleri
+_STATUS_COLORS = {
+    'R': '#28a745',  # Green - Running
+    'S': '#17a2b8',  # Cyan - Sleeping
+    'D': '#ffc107',  # Yellow - Disk Sleep
+    'Z': '#dc3545',  # Red - Zombie
+    'T': '#6c757d',  # Gray - Stopped
+    't': '#6c757d',  # Gray - Tracing Stop
+    'X': '#343a40',  # Dark - Dead
+    'x': '#343a40',  # Dark - Dead
+    'K': '#fd7e14',  # Orange - Wakekill
+    'W': '#20c997',  # Teal - Waking
+    'P': '#6f42c1',  # Purple - Parked
+}
+
+# /proc/<pid>/stat durum harfleri -> psutil durum isimleri
+_PROC_STATUSES = {
+    'R': 'running',
+    'S': 'sleeping',
+    'D': 'disk-sleep',
+    'T': 'stopped',
+    't': 'tracing-stop',
+    'Z': 'zombie',
+    'X': 'dead',
+    'x': 'dead',
+    'K': 'wake-kill',
+    'W': 'waking',
+    'I': 'idle',
+    'P': 'parked',
+}
+
+# Süreç toplama için paylaşılan thread havuzu (/proc okumaları GIL'i bırakır)
+_COLLECT_BATCH_SIZE = 64
+_collect_executor = ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 1) + 4),
+    thread_name_prefix='process-collector'
+)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+@lru_cache(maxsize=1024)
+def _uid_to_name(uid):
+    """UID'yi kullanıcı adına çevirir (pwd sorguları önbelleklenir)"""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@dataclass(slots=True)
+class ProcessData:
+    """
+    Toplanan süreç (graph düğümü) verisi
+    Dict yerine __slots__ kullanılır; dict/JSON dönüşümü yalnızca çıktı sınırında yapılır
+    """
+    pid: int
+    name: str
+    status: str
+    user: Optional[str]
+    cpu_percent: float
+    memory_percent: float
+    memory_rss: int
+    memory_vms: int
+    num_threads: int
+    create_time: str
+    create_time_epoch: float
+    parent_pid: Optional[int]
+    command_line: str
+    working_directory: Optional[str]
+    x: float = 0.0  # Graph pozisyonu
+    y: float = 0.0  # Graph pozisyonu
+    size: float = 1.0
+    color: str = '#6c757d'
+    
+    def to_dict(self):
+        """Süreç verisini dict olarak döndürür"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def processes_to_json(processes):
+    """ProcessData listesini JSON (bytes) olarak serileştirir"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(processes)
+    return json.dumps([process.to_dict() for process in processes]).encode('utf-8')
+
+
+@lru_cache(maxsize=1)
+def _get_total_memory():
+    """Toplam fiziksel belleği döndürür (çalışma süresince değişmez)"""
+    return psutil.virtual_memory().total
+
+
+@lru_cache(maxsize=1)
+def _get_boot_time():
+    """Sistem açılış zamanını döndürür (çalışma süresince değişmez)"""
+    return psutil.boot_time()
+
+
+@lru_cache(maxsize=4096)
+def _format_create_time(timestamp):
+    """
+    Epoch saniyesini yerel ISO formatına çevirir
+    Aynı saniyede başlayan süreçler önbellekteki metni paylaşır
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp))
+
+
+def _calculate_node_size(cpu_percent, memory_percent):
+    """Düğüm boyutunu CPU ve bellek kullanımına göre hesaplar"""
+    cpu_factor = min(cpu_percent / 10.0, 3.0)  # Max 3x
+    memory_factor = min(memory_percent / 5.0, 3.0)  # Max 3x
+    
+    return 1.0 + (cpu_factor + memory_factor) / 2
+
+
+# Bir önceki okumanın CPU örnekleri: (pid, starttime) -> (cpu ticks, monotonic zaman)
+# psutil.Process.cpu_percent() gibi CPU kullanımı iki okuma arasındaki farktan hesaplanır
+_cpu_samples = {}
+
+
+def read_proc_stats():
+    """
+    Süreçleri psutil nesneleri oluşturmadan doğrudan /proc/<pid>/stat üzerinden okur
+    Her süreç için tek bir okuma ve sahiplik için tek bir stat çağrısı yapılır
+    CPU yüzdesi bir önceki çağrıdan bu yana ölçülür; ilk görülen süreçte 0.0 döner
+    """
+    global _cpu_samples
+    total_memory = _get_total_memory()
+    boot_time = _get_boot_time()
+    now = time.monotonic()
+    previous_samples = _cpu_samples
+    samples = {}
+    
+    processes = []
+    with os.scandir('/proc') as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            
+            try:
+                with open(entry.path + '/stat', 'rb') as f:
+                    stat = f.read()
+                uid = entry.stat().st_uid
+            except OSError:
+                # Süreç okuma sırasında sonlanmış olabilir
+                continue
+            
+            # Süreç adı parantez içerebilir, bu yüzden son ')' karakterine göre ayır
+            name_start = stat.find(b'(')
+            name_end = stat.rfind(b')')
+            fields = stat[name_end + 2:].split()
+            
+            # Alan indeksleri (comm sonrası): state=0, ppid=1, utime=11, stime=12,
+            # num_threads=17, starttime=19, vsize=20, rss=21
+            pid = int(entry.name)
+            start_ticks = int(fields[19])
+            started = start_ticks / _CLOCK_TICKS
+            cpu_ticks = int(fields[11]) + int(fields[12])
+            rss = int(fields[21]) * _PAGE_SIZE
+            
+            # starttime anahtarı: PID yeniden kullanılmışsa eski örnek eşleşmez
+            key = (pid, start_ticks)
+            samples[key] = (cpu_ticks, now)
+            previous = previous_samples.get(key)
+            cpu_percent = 0.0
+            if previous is not None and now > previous[1]:
+                cpu_percent = ((cpu_ticks - previous[0]) / _CLOCK_TICKS) / (now - previous[1]) * 100
+            
+            processes.append({
+                'pid': pid,
+                'name': stat[name_start + 1:name_end].decode('utf-8', 'replace'),
+                'ppid': int(fields[1]),
+                'status': _PROC_STATUSES.get(fields[0].decode(), 'unknown'),
+                'cpu_percent': cpu_percent,
+                'memory_percent': (rss / total_memory) * 100 if total_memory else 0,
+                'memory_rss': rss,
+                'memory_vms': int(fields[20]),
+                'num_threads': int(fields[17]),
+                'create_time': boot_time + started,
+                'username': _uid_to_name(uid),
+            })
+    
+    # Sonlanan süreçlerin örnekleri bu atamayla düşer
+    _cpu_samples = samples
+    return processes
+
+
+@lru_cache(maxsize=None)
+def _get_platform_collector():
+    """Platform'a göre uygun collector'ı döndürür (süreç boyunca tek örnek)"""
+    current_platform = platform.system().lower()
+    if current_platform == 'linux':
+        return LinuxProcessCollector()
+    else:
+        raise NotImplementedError(f"Platform {current_platform} not supported")
+
 
 class ProcessCollector:
     """
@@ -20,14 +229,7 @@ class ProcessCollector:
     
     def __init__(self):
         self.platform = platform.system().lower()
-        self.collector = self._get_platform_collector()
-    
-    def _get_platform_collector(self):
-        """Platform'a göre uygun collector'ı döndürür"""
-        if self.platform == 'linux':
-            return LinuxProcessCollector()
-        else:
-            raise NotImplementedError(f"Platform {self.platform} not supported")
+        self.collector = _get_platform_collector()
     
     def collect_processes(self, **kwargs):
         """Süreçleri toplar"""
@@ -37,9 +239,9 @@ class ProcessCollector:
         """Bağlantıları toplar"""
         return self.collector.collect_connections(processes_data)
     
-    def get_process_details(self, pid):
+    def get_process_details(self, pid, detail_level='basic'):
         """Süreç detaylarını alır"""
-        return self.collector.get_process_details(pid)
+        return self.collector.get_process_details(pid, detail_level=detail_level)
     
     def get_process_connections(self, pid):
         """Süreç bağlantılarını alır"""
@@ -53,7 +255,25 @@ class LinuxProcessCollector:
     """
     
     def __init__(self):
-        self.system_info = self._get_system_info()
+        self._proc_cache = {}
+    
+    @cached_property
+    def system_info(self):
+        """Sistem bilgileri ilk erişimde bir kez toplanır"""
+        return self._get_system_info()
+    
+    def _get_proc(self, pid):
+        """PID için önbelleklenmiş psutil.Process nesnesini döndürür"""
+        process = self._proc_cache.get(pid)
+        
+        # is_running() oluşturulma zamanını da karşılaştırır; PID yeniden kullanılmışsa
+        # eski nesne geçersiz sayılır
+        if process is None or not process.is_running():
+            self._proc_cache.pop(pid, None)
+            process = psutil.Process(pid)
+            self._proc_cache[pid] = process
+        
+        return process
     
     def _get_system_info(self):
         """Sistem bilgilerini alır"""
@@ -82,60 +302,21 @@ class LinuxProcessCollector:
         """
         try:
             processes = []
-            collected = 0
+            pending = list(psutil.process_iter())
+            batch_size = max(limit, _COLLECT_BATCH_SIZE)
             
-            # Süreçleri topla
-            for proc in psutil.process_iter(['pid', 'name', 'status', 'username', 'cpu_percent', 
-                                           'memory_percent', 'memory_info', 'num_threads', 
-                                           'create_time', 'ppid', 'cmdline', 'cwd']):
-                try:
-                    if collected >= limit:
-                        break
-                    
-                    info = proc.info
-                    
-                    # Filtreleri uygula
-                    if status_filter and info['status'] != status_filter:
-                        continue
-                    if user_filter and user_filter not in info.get('username', ''):
-                        continue
-                    if search_query and search_query.lower() not in info.get('name', '').lower():
+            def collect(proc):
+                return self._collect_one(proc, status_filter, user_filter, search_query)
+            
+            # /proc okumaları thread havuzunda örtüştürülür; PID sırası ve limit korunur
+            for start in range(0, len(pending), batch_size):
+                for process_data in _collect_executor.map(collect, pending[start:start + batch_size]):
+                    if process_data is None:
                         continue
                     
-                    # Bellek bilgilerini al
-                    memory_info = info.get('memory_info')
-                    memory_rss = memory_info.rss if memory_info else 0
-                    memory_vms = memory_info.vms if memory_info else 0
-                    
-                    # Süreç verilerini hazırla
-                    process_data = {
-                        'pid': info['pid'],
-                        'name': info['name'],
-                        'status': info['status'],
-                        'user': info.get('username', 'unknown'),
-                        'cpu_percent': info.get('cpu_percent', 0.0),
-                        'memory_percent': info.get('memory_percent', 0.0),
-                        'memory_rss': memory_rss,
-                        'memory_vms': memory_vms,
-                        'num_threads': info.get('num_threads', 1),
-                        'create_time': datetime.fromtimestamp(info['create_time']).isoformat(),
-                        'parent_pid': info.get('ppid'),
-                        'command_line': ' '.join(info.get('cmdline', [])),
-                        'working_directory': info.get('cwd', ''),
-                        'x': 0.0,  # Graph pozisyonu
-                        'y': 0.0,  # Graph pozisyonu
-                        'size': self._calculate_node_size(info),
-                        'color': self._get_node_color(info)
-                    }
-                    
                     processes.append(process_data)
-                    collected += 1
-                    
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-                except Exception as e:
-                    logger.warning(f"Process collection error for PID {proc.pid}: {str(e)}")
-                    continue
+                    if len(processes) >= limit:
+                        return processes
             
             return processes
             
@@ -143,74 +324,155 @@ class LinuxProcessCollector:
             logger.error(f"Process collection error: {str(e)}")
             return []
     
-    def _calculate_node_size(self, process_info):
-        """Düğüm boyutunu hesaplar"""
-        cpu_percent = process_info.get('cpu_percent', 0.0)
-        memory_percent = process_info.get('memory_percent', 0.0)
+    def _collect_one(self, proc, status_filter='', user_filter='', search_query=''):
+        """Tek bir süreci filtreleyip toplar; atlanan süreçler için None döner"""
+        try:
+            info = self._read_process_info(proc, status_filter, user_filter, search_query)
+            if info is None:
+                return None
+            return self._build_process_data(info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        except Exception as e:
+            logger.warning(f"Process collection error for PID {proc.pid}: {str(e)}")
+            return None
+    
+    def collect_process(self, pid):
+        """Tek bir sürecin tüm verilerini toplar"""
+        return self._build_process_data(self._read_process_info(self._get_proc(pid)))
+    
+    def refresh_process(self, pid, process_data):
+        """
+        Daha önce toplanmış bir sürecin yalnızca değişken alanlarını (durum, CPU,
+        bellek) günceller; PID yeniden kullanılmışsa tam toplama yapar
+        """
+        process = self._get_proc(pid)
+        
+        with process.oneshot():
+            if process.create_time() != process_data.create_time_epoch:
+                return self.collect_process(pid)
+            
+            status = process.status()
+            cpu_percent = process.cpu_percent()
+            memory_percent = process.memory_percent()
         
-        # CPU ve bellek kullanımına göre boyut hesapla
-        base_size = 1.0
-        cpu_factor = min(cpu_percent / 10.0, 3.0)  # Max 3x
-        memory_factor = min(memory_percent / 5.0, 3.0)  # Max 3x
+        return replace(
+            process_data,
+            status=status,
+            cpu_percent=cpu_percent,
+            memory_percent=memory_percent,
+            size=_calculate_node_size(cpu_percent, memory_percent),
+            color=_STATUS_COLORS.get(status, '#6c757d')
+        )
+    
+    def _read_process_info(self, proc, status_filter='', user_filter='', search_query=''):
+        """
+        Sürecin özniteliklerini tek bir oneshot() bloğunda okur
+        Filtreler önce ucuz öznitelikler üzerinde uygulanır; eşleşmeyen süreçler için
+        ağır öznitelikler hiç okunmaz ve None döner
+        """
+        # oneshot: /proc/<pid>/stat ve status dosyaları tek seferde okunur
+        with proc.oneshot():
+            info = proc.as_dict(attrs=['pid', 'name', 'status', 'uids'])
+            
+            uids = info.pop('uids')
+            info['username'] = _uid_to_name(uids.real) if uids else None
+            
+            # Filtreleri uygula
+            if status_filter and info['status'] != status_filter:
+                return None
+            if user_filter and user_filter not in (info['username'] or ''):
+                return None
+            if search_query and search_query.lower() not in (info['name'] or '').lower():
+                return None
+            
+            info.update(proc.as_dict(attrs=['cpu_percent', 'memory_percent', 'memory_info',
+                                            'num_threads', 'create_time', 'ppid', 'cmdline', 'cwd']))
         
-        return base_size + (cpu_factor + memory_factor) / 2
+        return info
     
-    def _get_node_color(self, process_info):
-        """Düğüm rengini belirler"""
-        status = process_info.get('status', 'R')
+    def _build_process_data(self, info):
+        """Okunan süreç bilgilerinden graph düğüm verisini hazırlar"""
+        # Bellek bilgilerini al
+        memory_info = info.get('memory_info')
+        memory_rss = memory_info.rss if memory_info else 0
+        memory_vms = memory_info.vms if memory_info else 0
         
-        status_colors = {
-            'R': '#28a745',  # Green - Running
-            'S': '#17a2b8',  # Cyan - Sleeping
-            'D': '#ffc107',  # Yellow - Disk Sleep
-            'Z': '#dc3545',  # Red - Zombie
-            'T': '#6c757d',  # Gray - Stopped
-            't': '#6c757d',  # Gray - Tracing Stop
-            'X': '#343a40',  # Dark - Dead
-            'x': '#343a40',  # Dark - Dead
-            'K': '#fd7e14',  # Orange - Wakekill
-            'W': '#20c997',  # Teal - Waking
-            'P': '#6f42c1',  # Purple - Parked
-        }
+        cpu_percent = info.get('cpu_percent') or 0.0
+        memory_percent = info.get('memory_percent') or 0.0
         
-        return status_colors.get(status, '#6c757d')
+        return ProcessData(
+            pid=info['pid'],
+            name=info['name'],
+            status=info['status'],
+            user=info.get('username', 'unknown'),
+            cpu_percent=cpu_percent,
+            memory_percent=memory_percent,
+            memory_rss=memory_rss,
+            memory_vms=memory_vms,
+            num_threads=info.get('num_threads', 1),
+            create_time=_format_create_time(int(info['create_time'])),
+            create_time_epoch=info['create_time'],
+            parent_pid=info.get('ppid'),
+            command_line=' '.join(info.get('cmdline') or []),
+            working_directory=info.get('cwd', ''),
+            size=_calculate_node_size(cpu_percent, memory_percent),
+            color=_STATUS_COLORS.get(info['status'], '#6c757d')
+        )
+    
+    def prune_process_cache(self, pids):
+        """Artık izlenmeyen süreçlerin nesnelerini cache'ten çıkarır"""
+        self._proc_cache = {
+            pid: process for pid, process in self._proc_cache.items()
+            if pid in pids
+        }
     
     def collect_connections(self, processes_data):
         """
         Süreçler arası bağlantıları toplar
         """
         try:
-            connections = []
-            process_pids = {p['pid']: p for p in processes_data}
+            process_pids = {p.pid: p for p in processes_data}
+            port_to_pid, conns_by_pid = self._snapshot_connections()
+            
+            # Artık izlenmeyen süreçlerin nesnelerini cache'ten çıkar
+            self.prune_process_cache(process_pids)
+            
+            # Kenarlar önce (kaynak, hedef, metadata) tuple'ları olarak biriktirilir,
+            # dict'ler yalnızca dönüşte bir kez oluşturulur
+            parent_edges = []
+            network_edges = []
             
             for process_data in processes_data:
-                pid = process_data['pid']
-                parent_pid = process_data.get('parent_pid')
+                pid = process_data.pid
+                parent_pid = process_data.parent_pid
                 
                 # Ebeveyn-çocuk bağlantısı
                 if parent_pid and parent_pid in process_pids:
-                    connections.append({
-                        'source': parent_pid,
-                        'target': pid,
-                        'type': 'parent_child',
-                        'weight': 1.0,
-                        'color': '#007bff',
-                        'width': 1.0
-                    })
+                    parent_edges.append((parent_pid, pid))
                 
                 # Ağ bağlantıları
-                network_connections = self._get_network_connections(pid)
-                for conn in network_connections:
+                for conn in self._get_network_connections(conns_by_pid.get(pid, ()), port_to_pid):
                     if conn['remote_pid'] in process_pids:
-                        connections.append({
-                            'source': pid,
-                            'target': conn['remote_pid'],
-                            'type': 'network',
-                            'weight': conn.get('weight', 1.0),
-                            'color': '#28a745',
-                            'width': 1.0,
-                            'metadata': conn
-                        })
+                        network_edges.append((pid, conn['remote_pid'], conn))
+            
+            connections = [{
+                'source': source,
+                'target': target,
+                'type': 'parent_child',
+                'weight': 1.0,
+                'color': '#007bff',
+                'width': 1.0
+            } for source, target in parent_edges]
+            connections.extend({
+                'source': source,
+                'target': target,
+                'type': 'network',
+                'weight': conn['weight'],
+                'color': '#28a745',
+                'width': 1.0,
+                'metadata': conn
+            } for source, target, conn in network_edges)
             
             return connections
             
@@ -218,100 +480,115 @@ class LinuxProcessCollector:
             logger.error(f"Connection collection error: {str(e)}")
             return []
     
-    def _get_network_connections(self, pid):
-        """Sürecin ağ bağlantılarını alır"""
-        try:
-            process = psutil.Process(pid)
-            connections = process.connections()
-            
-            network_conns = []
-            for conn in connections:
-                if conn.raddr and conn.raddr.port:
-                    # Uzak port bilgisini kullanarak süreç bulmaya çalış
-                    remote_pid = self._find_process_by_port(conn.raddr.port)
-                    if remote_pid:
-                        network_conns.append({
-                            'remote_pid': remote_pid,
-                            'local_addr': f"{conn.laddr.ip}:{conn.laddr.port}",
-                            'remote_addr': f"{conn.raddr.ip}:{conn.raddr.port}",
-                            'status': conn.status,
-                            'weight': 1.0
-                        })
-            
-            return network_conns
-            
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return []
-        except Exception as e:
-            logger.warning(f"Network connections error for PID {pid}: {str(e)}")
-            return []
-    
-    def _find_process_by_port(self, port):
-        """Port kullanan süreci bulur"""
+    def _snapshot_connections(self):
+        """
+        Tek bir net_connections taramasıyla yerel port -> PID eşlemesini ve
+        PID'e göre gruplanmış bağlantıları oluşturur
+        """
+        port_to_pid = {}
+        conns_by_pid = {}
+        
         try:
-            for proc in psutil.process_iter(['pid', 'connections']):
-                try:
-                    connections = proc.connections()
-                    for conn in connections:
-                        if conn.laddr and conn.laddr.port == port:
-                            return proc.pid
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
+            for conn in psutil.net_connections(kind='inet'):
+                if not conn.pid:
                     continue
-        except Exception as e:
-            logger.warning(f"Port process finding error: {str(e)}")
+                if conn.laddr:
+                    port_to_pid[conn.laddr.port] = conn.pid
+                conns_by_pid.setdefault(conn.pid, []).append(conn)
+        except (psutil.AccessDenied, OSError) as e:
+            logger.warning(f"Connection snapshot error: {str(e)}")
         
-        return None
+        return port_to_pid, conns_by_pid
     
-    def get_process_details(self, pid):
-        """Belirli bir sürecin detay bilgilerini alır"""
+    def _get_network_connections(self, connections, port_to_pid):
+        """Sürecin ağ bağlantılarını uzak süreçlerle eşleştirir"""
+        network_conns = []
+        for conn in connections:
+            if conn.raddr and conn.raddr.port:
+                # Uzak port bilgisini kullanarak süreç bulmaya çalış
+                remote_pid = port_to_pid.get(conn.raddr.port)
+                if remote_pid:
+                    network_conns.append({
+                        'remote_pid': remote_pid,
+                        'local_addr': f"{conn.laddr.ip}:{conn.laddr.port}",
+                        'remote_addr': f"{conn.raddr.ip}:{conn.raddr.port}",
+                        'status': conn.status,
+                        'weight': 1.0
+                    })
+        
+        return network_conns
+    
+    def get_process_details(self, pid, detail_level='basic'):
+        """
+        Belirli bir sürecin detay bilgilerini alır
+        detail_level='full' ortam değişkenleri, bellek haritası, CPU affinity, thread
+        ve bağlantı sayısını da ekler (smaps/environ okumaları pahalıdır)
+        """
         try:
-            process = psutil.Process(pid)
+            process = self._get_proc(pid)
             
-            # Temel bilgiler
-            info = {
-                'pid': process.pid,
-                'name': process.name(),
-                'status': process.status(),
-                'username': process.username(),
-                'cpu_percent': process.cpu_percent(),
-                'memory_percent': process.memory_percent(),
-                'memory_info': {
-                    'rss': process.memory_info().rss,
-                    'vms': process.memory_info().vms,
-                    'shared': process.memory_info().shared if hasattr(process.memory_info(), 'shared') else 0,
-                    'text': process.memory_info().text if hasattr(process.memory_info(), 'text') else 0,
-                    'data': process.memory_info().data if hasattr(process.memory_info(), 'data') else 0,
-                },
-                'num_threads': process.num_threads(),
-                'create_time': datetime.fromtimestamp(process.create_time()).isoformat(),
-                'parent_pid': process.ppid(),
-                'command_line': ' '.join(process.cmdline()),
-                'working_directory': process.cwd(),
-                'environment': dict(process.environ()),
-                'io_counters': {
-                    'read_count': process.io_counters().read_count if process.io_counters() else 0,
-                    'write_count': process.io_counters().write_count if process.io_counters() else 0,
-                    'read_bytes': process.io_counters().read_bytes if process.io_counters() else 0,
-                    'write_bytes': process.io_counters().write_bytes if process.io_counters() else 0,
-                },
-                'connections': len(process.connections()),
-                'open_files': len(process.open_files()),
-                'children': [child.pid for child in process.children(recursive=False)],
-                'nice': process.nice(),
-                'ionice': process.ionice() if hasattr(process, 'ionice') else None,
-            }
+            # oneshot: stat/status dosyaları tüm erişimler için bir kez okunur
+            with process.oneshot():
+                create_time = process.create_time()
+                memory_info = process.memory_info()
+                
+                try:
+                    io_counters = process.io_counters()
+                except (psutil.AccessDenied, AttributeError):
+                    io_counters = None
+                
+                # Temel bilgiler
+                info = {
+                    'pid': process.pid,
+                    'name': process.name(),
+                    'status': process.status(),
+                    'username': process.username(),
+                    'cpu_percent': process.cpu_percent(),
+                    'memory_percent': process.memory_percent(),
+                    'memory_info': {
+                        'rss': memory_info.rss,
+                        'vms': memory_info.vms,
+                        'shared': getattr(memory_info, 'shared', 0),
+                        'text': getattr(memory_info, 'text', 0),
+                        'data': getattr(memory_info, 'data', 0),
+                    },
+                    'num_threads': process.num_threads(),
+                    'create_time': _format_create_time(int(create_time)),
+                    'create_time_epoch': create_time,
+                    'parent_pid': process.ppid(),
+                    'command_line': ' '.join(process.cmdline()),
+                    'working_directory': process.cwd(),
+                    'io_counters': {
+                        'read_count': io_counters.read_count if io_counters else 0,
+                        'write_count': io_counters.write_count if io_counters else 0,
+                        'read_bytes': io_counters.read_bytes if io_counters else 0,
+                        'write_bytes': io_counters.write_bytes if io_counters else 0,
+                    },
+                    'open_files': len(process.open_files()),
+                    'children': [child.pid for child in process.children(recursive=False)],
+                    'nice': process.nice(),
+                    'ionice': process.ionice() if hasattr(process, 'ionice') else None,
+                }
             
             # Linux özel bilgiler
             try:
-                info.update({
-                    'num_fds': process.num_fds(),
-                    'cpu_affinity': process.cpu_affinity(),
-                    'memory_maps': self._get_memory_maps(pid),
-                    'threads': self._get_thread_info(pid),
-                })
+                info['num_fds'] = process.num_fds()
             except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
                 pass
             
+            # Pahalı detaylar yalnızca istenirse
+            if detail_level == 'full':
+                try:
+                    info.update({
+                        'environment': dict(process.environ()),
+                        'connections': len(process.connections()),
+                        'cpu_affinity': process.cpu_affinity(),
+                        'memory_maps': self._get_memory_maps(pid),
+                        'threads': self._get_thread_info(pid),
+                    })
+                except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+                    pass
+            
             return info
             
         except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
@@ -324,7 +601,7 @@ class LinuxProcessCollector:
     def _get_memory_maps(self, pid):
         """Sürecin bellek haritasını alır"""
         try:
-            process = psutil.Process(pid)
+            process = self._get_proc(pid)
             maps = process.memory_maps()
             return [{
                 'path': mmap.path,
@@ -346,7 +623,7 @@ class LinuxProcessCollector:
     def _get_thread_info(self, pid):
         """Sürecin thread bilgilerini alır"""
         try:
-            process = psutil.Process(pid)
+            process = self._get_proc(pid)
             threads = process.threads()
             return [{
                 'id': thread.id,
@@ -360,7 +637,7 @@ class LinuxProcessCollector:
     def get_process_connections(self, pid):
         """Sürecin bağlantılarını alır"""
         try:
-            process = psutil.Process(pid)
+            process = self._get_proc(pid)
             connections = process.connections()
             
             conn_data = []
@@ -399,6 +676,26 @@ class SystemInfoCollector:
         self.cached_info = None
         self.cache_time = 0
         self.cache_duration = 5  # 5 saniye cache
+        
+        # Disk bölümleri ve ağ arayüzleri nadiren değişir, daha uzun cache
+        self.cached_sections = {}
+        self.section_cache_duration = 30  # 30 saniye cache
+        
+        # cpu_percent(interval=None) bir önceki çağrıya göre fark hesaplar,
+        # ilk ölçüm için referans noktası oluştur
+        psutil.cpu_percent(interval=None)
+    
+    def _get_cached_section(self, key, loader):
+        """Disk/ağ gibi yavaş değişen bölümleri TTL ile cache'ler"""
+        current_time = time.time()
+        cached = self.cached_sections.get(key)
+        
+        if cached and (current_time - cached[0]) < self.section_cache_duration:
+            return cached[1]
+        
+        value = loader()
+        self.cached_sections[key] = (current_time, value)
+        return value
     
     def get_system_info(self):
         """Sistem bilgilerini alır"""
@@ -424,8 +721,8 @@ class SystemInfoCollector:
                 'boot_time': psutil.boot_time(),
                 'uptime': time.time() - psutil.boot_time(),
                 'load_average': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0],
-                'disk_usage': self._get_disk_usage(),
-                'network_info': self._get_network_info(),
+                'disk_usage': self._get_cached_section('disk_usage', self._get_disk_usage),
+                'network_info': self._get_cached_section('network_info', self._get_network_info),
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
             
@@ -444,8 +741,8 @@ class SystemInfoCollector:
     def get_system_metrics(self):
         """Sistem metriklerini alır"""
         try:
-            # CPU bilgileri
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU bilgileri (bloklamayan ölçüm, son çağrıdan bu yana)
+            cpu_percent = psutil.cpu_percent(interval=None)
             cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             
@@ -558,6 +855,11 @@ class ProcessMonitor:
         self.callback = callback
         self.monitoring = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()
+        
+        # Bir önceki tick'te toplanan süreçler (PID -> süreç verisi)
+        self._last_pids = set()
+        self._last_snapshots = {}
     
     def start_monitoring(self, interval=5):
         """İzlemeyi başlatır"""
@@ -565,6 +867,7 @@ class ProcessMonitor:
             return
         
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(
             target=self._monitor_loop,
             args=(interval,),
@@ -575,20 +878,28 @@ class ProcessMonitor:
     def stop_monitoring(self):
         """İzlemeyi durdurur"""
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1)
     
     def _monitor_loop(self, interval):
         """İzleme döngüsü"""
+        # Collector'lar döngü boyunca yeniden kullanılır; psutil süreç nesneleri
+        # (cpu_percent örnekleri) ve sistem bilgisi cache'leri tick'ler arasında korunur
         collector = LinuxProcessCollector()
+        system_collector = SystemInfoCollector()
+        
+        # Tick'ler monotonic bir takvime göre planlanır; toplama süresi aralığa
+        # eklenmediği için cpu_percent farkları sabit aralıklarla ölçülür
+        next_tick = time.monotonic() + interval
         
         while self.monitoring:
             try:
-                # Süreçleri topla
-                processes = collector.collect_processes(limit=200)
+                # Süreçleri topla (yalnızca yeni PID'ler için tam toplama)
+                processes = self._collect_delta(collector, limit=200)
                 
                 # Sistem metriklerini al
-                system_metrics = SystemInfoCollector().get_system_metrics()
+                system_metrics = system_collector.get_system_metrics()
                 
                 # Callback'i çağır
                 if self.callback:
@@ -598,11 +909,45 @@ class ProcessMonitor:
                         'timestamp': datetime.now(timezone.utc).isoformat()
                     })
                 
-                time.sleep(interval)
-                
             except Exception as e:
                 logger.error(f"Monitoring loop error: {str(e)}")
-                time.sleep(interval)
+            
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                next_tick += interval
+                # stop_monitoring() çağrıldığında beklemeden çık
+                self._stop_event.wait(sleep_for)
+            else:
+                # Toplama aralıktan uzun sürdü; kaçırılan tick'leri atla
+                logger.warning(f"Process monitor overrun: tick {-sleep_for:.2f}s late")
+                next_tick = time.monotonic() + interval
+    
+    def _collect_delta(self, collector, limit=200):
+        """
+        Yeni ortaya çıkan PID'ler için tüm öznitelikleri toplar, önceki tick'ten
+        devam eden süreçlerin yalnızca durum/CPU/bellek değerlerini yeniler
+        """
+        current_pids = sorted(psutil.pids())[:limit]
+        snapshots = {}
+        
+        for pid in current_pids:
+            try:
+                if pid in self._last_pids:
+                    snapshots[pid] = collector.refresh_process(pid, self._last_snapshots[pid])
+                else:
+                    snapshots[pid] = collector.collect_process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            except Exception as e:
+                logger.warning(f"Process collection error for PID {pid}: {str(e)}")
+                continue
+        
+        # Sonlanan süreçler snapshot'lardan ve Process cache'inden düşer
+        self._last_pids = set(snapshots)
+        self._last_snapshots = snapshots
+        collector.prune_process_cache(self._last_pids)
+        
+        return list(snapshots.values())
 
 
 
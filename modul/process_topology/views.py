@@ -1,11 +1,31 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.translation import gettext as _
 import json
-import psutil
 import os
 from collections import defaultdict
+from .utils import read_proc_stats
+
+# Optional fast JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Node type by process status
+_TYPE_MAPPING = {
+    'running': 0,
+    'sleeping': 1,
+    'stopped': 2,
+    'zombie': 3,
+    'disk-sleep': 4,
+    'dead': 5,
+    'waking': 6,
+    'parked': 7
+}
 
 
 def index(request):
@@ -20,60 +40,40 @@ def index(request):
 def get_topology_data(request):
     """API endpoint to get process topology data"""
     try:
-        # Get all running processes
-        processes = []
+        # Add system node as root
+        nodes = [{
+            'id': '0',
+            'name': 'System',
+            'type': -1,
+            'size': 30,
+            'status': 'system',
+            'cpu_percent': 0,
+            'memory_percent': 0,
+            'username': 'system'
+        }]
         process_connections = defaultdict(list)
         
-        for proc in psutil.process_iter(['pid', 'name', 'ppid', 'status', 'cpu_percent', 'memory_percent', 'username']):
-            try:
-                proc_info = proc.info
-                processes.append({
-                    'id': str(proc_info['pid']),
-                    'name': proc_info['name'],
-                    'ppid': str(proc_info['ppid']) if proc_info['ppid'] else None,
-                    'status': proc_info['status'],
-                    'cpu_percent': proc_info['cpu_percent'] or 0,
-                    'memory_percent': proc_info['memory_percent'] or 0,
-                    'username': proc_info['username'] or 'unknown'
-                })
-                
-                # Create parent-child relationships
-                if proc_info['ppid']:
-                    process_connections[str(proc_info['ppid'])].append(str(proc_info['pid']))
-                    
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-        
-        # Create nodes
-        nodes = []
-        for proc in processes:
-            # Determine process type based on status
-            type_mapping = {
-                'running': 0,
-                'sleeping': 1,
-                'stopped': 2,
-                'zombie': 3,
-                'disk-sleep': 4,
-                'dead': 5,
-                'waking': 6,
-                'parked': 7
-            }
-            
-            proc_type = type_mapping.get(proc['status'], 0)
-            
-            # Calculate size based on memory usage
-            size = max(5, min(50, proc['memory_percent'] * 2))
+        # Create nodes from all running processes in a single pass
+        for proc_info in read_proc_stats():
+            pid = str(proc_info['pid'])
+            memory_percent = proc_info['memory_percent'] or 0
             
             nodes.append({
-                'id': proc['id'],
-                'name': proc['name'],
-                'type': proc_type,
-                'size': size,
-                'status': proc['status'],
-                'cpu_percent': proc['cpu_percent'],
-                'memory_percent': proc['memory_percent'],
-                'username': proc['username']
+                'id': pid,
+                'name': proc_info['name'],
+                # Determine process type based on status
+                'type': _TYPE_MAPPING.get(proc_info['status'], 0),
+                # Calculate size based on memory usage
+                'size': max(5, min(50, memory_percent * 2)),
+                'status': proc_info['status'],
+                'cpu_percent': proc_info['cpu_percent'] or 0,
+                'memory_percent': memory_percent,
+                'username': proc_info['username'] or 'unknown'
             })
+            
+            # Create parent-child relationships
+            if proc_info['ppid']:
+                process_connections[str(proc_info['ppid'])].append(pid)
         
         # Create links (parent-child relationships)
         links = []
@@ -85,21 +85,9 @@ def get_topology_data(request):
                     'type': 'parent-child'
                 })
         
-        # Add system node as root
-        system_node = {
-            'id': '0',
-            'name': 'System',
-            'type': -1,
-            'size': 30,
-            'status': 'system',
-            'cpu_percent': 0,
-            'memory_percent': 0,
-            'username': 'system'
-        }
-        nodes.insert(0, system_node)
-        
-        # Connect system to main processes
-        main_processes = [node for node in nodes[1:] if not any(link['target'] == node['id'] for link in links)]
+        # Connect system to main processes (processes that are not a link target)
+        linked_targets = {link['target'] for link in links}
+        main_processes = [node for node in nodes[1:] if node['id'] not in linked_targets]
         for proc in main_processes[:10]:  # Limit to first 10 main processes
             links.append({
                 'source': '0',
@@ -111,9 +99,11 @@ def get_topology_data(request):
             'nodes': nodes,
             'links': links,
             'status': 'success',
-            'total_processes': len(processes)
+            'total_processes': len(nodes) - 1
         }
         
+        if ORJSON_AVAILABLE:
+            return HttpResponse(orjson.dumps(data), content_type='application/json')
         return JsonResponse(data)
         
     except Exception as e:
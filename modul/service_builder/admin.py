@@ -1,3 +1,32 @@
 from django.contrib import admin
+from .models import ServiceTemplate, ServiceLog, ServiceConfiguration
 
-# Register your models here.
+
+@admin.register(ServiceTemplate)
+class ServiceTemplateAdmin(admin.ModelAdmin):
+    list_display = ['name', 'service_type', 'is_active', 'created_at']
+    list_filter = ['service_type', 'is_active']
+    search_fields = ['name', 'description']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['-created_at']
+
+
+@admin.register(ServiceConfiguration)
+class ServiceConfigurationAdmin(admin.ModelAdmin):
+    list_display = ['name', 'service_type', 'user', 'port', 'is_active', 'created_at']
+    list_filter = ['service_type', 'is_active']
+    search_fields = ['name', 'description', 'application_path']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['-created_at']
+
+
+@admin.register(ServiceLog)
+class ServiceLogAdmin(admin.ModelAdmin):
+    list_display = ['service_name', 'action', 'status', 'user', 'ip_address', 'created_at']
+    list_filter = ['status', 'action']
+    search_fields = ['service_name', 'message']
+    readonly_fields = ['created_at']
+    ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+    # Büyük log tablolarında sayfa başına ikinci COUNT(*) sorgusunu atla
+    show_full_result_count = False
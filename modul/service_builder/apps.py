@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class ServiceBuilderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modul.service_builder'
-    verbose_name = 'Service Builder'
\ No newline at end of file
+    verbose_name = 'Service Builder'
+    
+    def ready(self):
+        """Initialize the app when Django starts"""
+        # Import signal handlers
+        from . import signals  # noqa: F401
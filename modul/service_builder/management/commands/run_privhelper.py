@@ -0,0 +1,59 @@
+"""
+Management command to run the Service Builder privileged helper
+Runs as root and executes whitelisted systemctl commands for the web process,
+which then no longer needs a sudo call per service operation.
+
+Example systemd unit (adjust paths to the installation):
+
+    [Unit]
+    Description=Ophiron Service Builder privileged helper
+    After=network.target
+
+    [Service]
+    ExecStart=/path/to/venv/bin/python /path/to/Ophiron/manage.py run_privhelper --allow-user ophiron
+    Restart=on-failure
+
+    [Install]
+    WantedBy=multi-user.target
+"""
+
+import asyncio
+import os
+import pwd
+
+from django.core.management.base import BaseCommand, CommandError
+from modul.service_builder import privhelper
+
+
+class Command(BaseCommand):
+    help = 'Run the privileged helper that executes systemctl commands for Service Builder'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--allow-user',
+            action='append',
+            required=True,
+            help='User the web process runs as; may be given more than once',
+        )
+        parser.add_argument(
+            '--socket',
+            default=privhelper.SOCKET_PATH,
+            help=f'Unix socket path (default: {privhelper.SOCKET_PATH})',
+        )
+
+    def handle(self, *args, **options):
+        if os.geteuid() != 0:
+            raise CommandError('The privileged helper must run as root')
+
+        allowed_uids = set()
+        for name in options['allow_user']:
+            try:
+                allowed_uids.add(pwd.getpwnam(name).pw_uid)
+            except KeyError:
+                raise CommandError(f"Unknown user: {name}")
+
+        self.stdout.write(f"Privileged helper listening on {options['socket']}")
+        try:
+            asyncio.run(privhelper.serve(frozenset(allowed_uids), options['socket']))
+        except KeyboardInterrupt:
+            pass
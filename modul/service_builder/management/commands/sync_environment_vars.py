@@ -0,0 +1,24 @@
+"""
+Management command to backfill parsed service environment variables
+Fills ServiceConfiguration.environment_vars_json for rows saved before the column existed.
+Safe to run repeatedly; entrypoint.sh runs it after migrate on every deploy.
+"""
+
+from django.core.management.base import BaseCommand
+from modul.service_builder.models import ServiceConfiguration
+
+
+class Command(BaseCommand):
+    help = 'Backfill parsed environment variables of service configurations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per bulk update (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        updated = ServiceConfiguration.objects.sync_environment_vars_json(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated environment variables of {updated} service configurations'))
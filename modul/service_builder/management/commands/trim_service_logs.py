@@ -0,0 +1,55 @@
+"""
+Management command to delete old service builder logs
+Run this command periodically (e.g. nightly via cron) to keep ServiceLog and its indexes small
+"""
+
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+from django.utils import timezone
+from modul.service_builder.models import ServiceLog
+
+_DURATION_RE = re.compile(r'^(\d+)([dhm]?)$')
+_DURATION_UNITS = {'d': 'days', 'h': 'hours', 'm': 'minutes', '': 'days'}
+
+
+def parse_duration(value):
+    """Parse '30d', '12h', '90m' or a plain number of days into a timedelta"""
+    match = _DURATION_RE.match(value.strip().lower())
+    if not match:
+        raise CommandError(f"Invalid duration: {value} (expected e.g. 30d, 12h, 90m)")
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit]: int(amount)})
+
+
+class Command(BaseCommand):
+    help = 'Delete service builder logs older than the given age'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            default='30d',
+            help='Age of logs to delete, e.g. 30d, 12h, 90m (default: 30d)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the logs that would be deleted',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - parse_duration(options['older_than'])
+        queryset = ServiceLog.objects.filter(created_at__lt=cutoff)
+
+        if options['dry_run']:
+            count = queryset.count()
+            self.stdout.write(f'{count} service logs older than {cutoff.isoformat()} would be deleted')
+            return
+
+        # ServiceLog'a referans veren model yok; _raw_delete satırları Python'a yüklemeden tek DELETE çalıştırır
+        deleted = queryset._raw_delete(using=router.db_for_write(ServiceLog))
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} service logs older than {cutoff.isoformat()}')
+        )
@@ -1,7 +1,38 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import connections, models, router
 from django.utils import timezone
+from django.utils.functional import cached_property
+import csv
+import io
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonEncoder(json.JSONEncoder):
+    """JSONField encoder that serializes with orjson when it is installed"""
+    
+    def encode(self, o):
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(o).decode()
+            except TypeError:
+                # orjson'un desteklemediği tipler stdlib json'a düşer
+                pass
+        return super().encode(o)
+
+
+class ServiceTemplateManager(models.Manager):
+    """Manager for service templates"""
+    
+    def for_list(self):
+        """Templates without template_content for list pages"""
+        return self.only('id', 'name', 'description', 'service_type', 'created_at', 'is_active')
+
 
 class ServiceTemplate(models.Model):
     """Model for service templates"""
@@ -23,15 +54,71 @@ class ServiceTemplate(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True, verbose_name="Active")
     
+    objects = ServiceTemplateManager()
+    
     class Meta:
         verbose_name = "Service Template"
         verbose_name_plural = "Service Templates"
         ordering = ['-created_at']
+        get_latest_by = 'created_at'
     
     def __str__(self):
         return self.name
 
 
+class ServiceLogManager(models.Manager):
+    """Manager for service operation logs"""
+    
+    def for_list(self):
+        """Logs for list pages as named tuples (no model instance per row)"""
+        return self.get_queryset().values_list(
+            'service_name', 'action', 'status', 'message', 'user', 'created_at', named=True
+        )
+    
+    def copy_from(self, entries):
+        """Insert log rows with PostgreSQL COPY FROM STDIN (psycopg2 or psycopg 3)"""
+        entries = self.model.prepare_log_entries(entries)
+        if not entries:
+            return 0
+        connection = connections[router.db_for_write(self.model)]
+        qn = connection.ops.quote_name
+        columns = ('service_name', 'action', 'status', 'message',
+                   'user', 'ip_address', 'details', 'created_at')
+        encoder = OrjsonEncoder()
+        
+        # None "" olarak yazılır; nullable kolonlar FORCE_NULL ile NULL'a çevrilir
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        for entry in entries:
+            details = entry.get('details')
+            writer.writerow([
+                entry['service_name'],
+                entry['action'],
+                entry['status'],
+                entry['message'],
+                entry.get('user', 'Anonymous'),
+                entry.get('ip_address'),
+                encoder.encode(details) if details is not None else None,
+                entry['created_at'].isoformat(),
+            ])
+        
+        nullable = ('ip_address', 'details')
+        sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv, FORCE_NULL ({}))'.format(
+            qn(self.model._meta.db_table),
+            ', '.join(qn(column) for column in columns),
+            ', '.join(qn(column) for column in nullable),
+        )
+        with connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, 'copy_expert'):
+                buffer.seek(0)
+                raw_cursor.copy_expert(sql, buffer)
+            else:
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        return len(entries)
+
+
 class ServiceLog(models.Model):
     """Model for service operation logs"""
     service_name = models.CharField(max_length=100, verbose_name="Service Name")
@@ -40,23 +127,86 @@ class ServiceLog(models.Model):
     message = models.TextField(verbose_name="Message")
     user = models.CharField(max_length=100, default='Anonymous', verbose_name="User")
     ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name="IP Address")
-    details = models.JSONField(null=True, blank=True, verbose_name="Details")
+    details = models.JSONField(null=True, blank=True, encoder=OrjsonEncoder, verbose_name="Details")
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ServiceLogManager()
+    
     class Meta:
         verbose_name = "Service Log"
         verbose_name_plural = "Service Logs"
         ordering = ['-created_at']
+        get_latest_by = 'created_at'
+        indexes = [
+            models.Index(fields=['service_name', '-created_at'], name='svclog_name_created_idx'),
+            models.Index(fields=['-created_at'], name='svclog_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.service_name} - {self.action} ({self.status})"
+    
+    @classmethod
+    def prepare_log_entries(cls, entries):
+        """Copy field dicts and fill created_at for batch inserts"""
+        now = timezone.now()
+        entries = [dict(entry) for entry in entries]
+        for entry in entries:
+            # bulk_create save() çağırmaz; tüm batch tek zaman damgası alır
+            entry.setdefault('created_at', now)
+        return entries
+    
+    @classmethod
+    def bulk_log(cls, entries, batch_size=50):
+        """Create log rows from an iterable of field dicts with multi-row INSERTs"""
+        logs = [cls(**entry) for entry in cls.prepare_log_entries(entries)]
+        if not logs:
+            return []
+        return cls.objects.bulk_create(logs, batch_size=batch_size)
+
+
+def parse_environment_vars(text):
+    """Parse KEY=VALUE lines into a dictionary"""
+    if not text:
+        return {}
+    # '#' ile başlayan satırlar yorum olarak atlanır
+    return {
+        key.strip(): value.strip()
+        for line in text.splitlines()
+        if '=' in line and not line.lstrip().startswith('#')
+        for key, _, value in [line.partition('=')]
+    }
+
+
+class ServiceConfigurationManager(models.Manager):
+    """Manager for service configurations"""
+    
+    def for_list(self):
+        """Configurations without paths and environment_vars for list pages"""
+        return self.only('id', 'name', 'description', 'service_type', 'user', 'created_at', 'is_active')
+    
+    def sync_environment_vars_json(self, batch_size=500):
+        """Backfill environment_vars_json for rows saved before the column existed"""
+        updated = 0
+        batch = []
+        rows = self.get_queryset().only('id', 'environment_vars', 'environment_vars_json')
+        for service in rows.iterator(chunk_size=batch_size):
+            parsed = parse_environment_vars(service.environment_vars)
+            if parsed != service.environment_vars_json:
+                service.environment_vars_json = parsed
+                batch.append(service)
+            if len(batch) >= batch_size:
+                updated += self.bulk_update(batch, ['environment_vars_json'])
+                batch = []
+        if batch:
+            updated += self.bulk_update(batch, ['environment_vars_json'])
+        return updated
 
 
 class ServiceConfiguration(models.Model):
     """Model for service configurations"""
     name = models.CharField(max_length=100, unique=True, verbose_name="Service Name")
     description = models.TextField(blank=True, verbose_name="Description")
-    service_type = models.CharField(max_length=20, verbose_name="Service Type")
+    service_type = models.CharField(max_length=20, db_index=True, verbose_name="Service Type")
     application_path = models.CharField(max_length=500, verbose_name="Application Path")
     interpreter = models.CharField(max_length=200, blank=True, verbose_name="Interpreter")
     user = models.CharField(max_length=100, verbose_name="User")
@@ -65,26 +215,94 @@ class ServiceConfiguration(models.Model):
     host = models.CharField(max_length=100, default='0.0.0.0', verbose_name="Host")
     restart_policy = models.CharField(max_length=20, default='always', verbose_name="Restart Policy")
     environment_vars = models.TextField(blank=True, verbose_name="Environment Variables")
-    is_active = models.BooleanField(default=True, verbose_name="Active")
+    # environment_vars'ın save() sırasında parse edilmiş hali
+    environment_vars_json = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Parsed Environment Variables")
+    is_active = models.BooleanField(default=True, db_index=True, verbose_name="Active")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ServiceConfigurationManager()
+    
     class Meta:
         verbose_name = "Service Configuration"
         verbose_name_plural = "Service Configurations"
         ordering = ['-created_at']
+        get_latest_by = 'created_at'
+        indexes = [
+            # Partial index: SQLite ve PostgreSQL destekler
+            models.Index(fields=['service_type'], condition=models.Q(is_active=True), name='svc_active_type_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(port__isnull=True) | models.Q(port__range=(1, 65535)),
+                name='svc_port_range'
+            ),
+            models.CheckConstraint(condition=~models.Q(name=''), name='svc_name_nonempty'),
+        ]
     
     def __str__(self):
         return self.name
     
-    def get_environment_vars_dict(self):
-        """Convert environment variables string to dictionary"""
-        if not self.environment_vars:
-            return {}
-        
-        env_dict = {}
-        for line in self.environment_vars.split('\n'):
-            if '=' in line:
-                key, value = line.split('=', 1)
-                env_dict[key.strip()] = value.strip()
-        return env_dict
\ No newline at end of file
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Yüklenen değer, save() sırasında cache invalidation için saklanır
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def save(self, *args, **kwargs):
+        loaded_values = getattr(self, '_loaded_values', None)
+        if loaded_values is None or loaded_values.get('environment_vars') != self.environment_vars:
+            self.__dict__.pop('environment_vars_dict', None)
+            self.environment_vars_json = parse_environment_vars(self.environment_vars)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'environment_vars' in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'environment_vars_json']
+        super().save(*args, **kwargs)
+        self._invalidate_cache(loaded_values)
+        self._loaded_values = {'name': self.name, 'environment_vars': self.environment_vars}
+    
+    def save_patch(self, **fields):
+        """Set the given fields and UPDATE only the ones whose value changed"""
+        changed = [name for name, value in fields.items() if getattr(self, name) != value]
+        for name in changed:
+            setattr(self, name, fields[name])
+        if changed:
+            self.save(update_fields=changed + ['updated_at'])
+        return changed
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_cache(getattr(self, '_loaded_values', None))
+        return result
+    
+    @staticmethod
+    def _cache_key(name):
+        return f'svc:{name}'
+    
+    def _invalidate_cache(self, loaded_values=None):
+        keys = {self._cache_key(self.name)}
+        # Yeniden adlandırılan servisin eski anahtarı da silinir
+        if loaded_values and loaded_values.get('name'):
+            keys.add(self._cache_key(loaded_values['name']))
+        cache.delete_many(keys)
+    
+    @classmethod
+    def get_cached(cls, name, timeout=60):
+        """Get configuration by name through the cache (raises DoesNotExist)"""
+        key = cls._cache_key(name)
+        service = cache.get(key)
+        if service is None:
+            service = cls.objects.get(name=name)
+            cache.set(key, service, timeout)
+        return service
+    
+    @cached_property
+    def environment_vars_dict(self):
+        """Environment variables as a dictionary (cached per instance)"""
+        loaded_values = getattr(self, '_loaded_values', None)
+        unchanged = loaded_values is not None and loaded_values.get('environment_vars') == self.environment_vars
+        # Kaydedilmiş JSON kolonu geçerliyse yeniden parse etme
+        if unchanged and (self.environment_vars_json or not self.environment_vars):
+            return self.environment_vars_json
+        return parse_environment_vars(self.environment_vars)
@@ -0,0 +1,139 @@
+"""
+Service Builder privileged helper
+A small root process that runs whitelisted systemctl commands for the web
+process over a Unix socket, so service operations do not pay a sudo/PAM
+round trip per call. Started with `manage.py run_privhelper`.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import struct
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = os.environ.get('OPHIRON_PRIVHELPER_SOCKET', '/run/ophiron-privhelper.sock')
+REQUEST_TIMEOUT = 60.0  # seconds
+
+# Helper yalnızca bu systemctl verb'lerini ve .service unit adlarını kabul eder
+_ALLOWED_SYSTEMCTL_VERBS = frozenset({
+    'daemon-reload', 'start', 'stop', 'restart', 'enable', 'disable', 'reenable',
+})
+_UNIT_RE = re.compile(r'[A-Za-z0-9_.@-]{1,100}\.service')
+_PEERCRED = struct.Struct('3i')  # pid, uid, gid
+
+
+def validate_systemctl_args(args):
+    """True if args is a systemctl invocation the helper is allowed to run"""
+    if not isinstance(args, list) or not args or not all(isinstance(arg, str) for arg in args):
+        return False
+    verb, *rest = args
+    if verb not in _ALLOWED_SYSTEMCTL_VERBS:
+        return False
+    if verb == 'daemon-reload':
+        return not rest
+    if verb == 'enable' and rest[:1] == ['--now']:
+        rest = rest[1:]
+    return len(rest) == 1 and bool(_UNIT_RE.fullmatch(rest[0]))
+
+
+# ===== CLIENT =====
+
+def _encode_request(args):
+    return json.dumps({'op': 'systemctl', 'args': list(args)}).encode() + b'\n'
+
+
+def _decode_response(line):
+    response = json.loads(line)
+    return response['returncode'], response.get('stderr', '')
+
+
+def helper_available():
+    return os.path.exists(SOCKET_PATH)
+
+
+def systemctl(*args):
+    """Run systemctl through the helper; returns (returncode, stderr) or None if unreachable"""
+    if not helper_available():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(REQUEST_TIMEOUT)
+            sock.connect(SOCKET_PATH)
+            sock.sendall(_encode_request(args))
+            with sock.makefile('rb') as reader:
+                return _decode_response(reader.readline())
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Privileged helper unavailable, falling back to sudo: {e}")
+        return None
+
+
+async def asystemctl(*args):
+    """Async systemctl(); returns (returncode, stderr) or None if unreachable"""
+    if not helper_available():
+        return None
+    try:
+        reader, writer = await asyncio.open_unix_connection(SOCKET_PATH)
+        try:
+            writer.write(_encode_request(args))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+        finally:
+            writer.close()
+        return _decode_response(line)
+    except (OSError, ValueError, KeyError, asyncio.TimeoutError) as e:
+        logger.warning(f"Privileged helper unavailable, falling back to sudo: {e}")
+        return None
+
+
+# ===== SERVER =====
+
+async def _handle_client(reader, writer, allowed_uids):
+    sock = writer.get_extra_info('socket')
+    try:
+        # SO_PEERCRED: bağlanan process'in uid'i kernel tarafından doğrulanır
+        _pid, uid, _gid = _PEERCRED.unpack(
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+        )
+        if uid not in allowed_uids:
+            logger.warning(f"Rejected privileged helper connection from uid {uid}")
+            return
+
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                args = request.get('args') if request.get('op') == 'systemctl' else None
+            except (ValueError, AttributeError):
+                args = None
+
+            if not validate_systemctl_args(args):
+                response = {'returncode': 2, 'stderr': 'Request rejected by privileged helper'}
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    'systemctl', *args,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+                )
+                _stdout, stderr = await proc.communicate()
+                response = {'returncode': proc.returncode, 'stderr': stderr.decode(errors='replace')}
+
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+    except Exception as e:
+        logger.error(f"Privileged helper request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def serve(allowed_uids, path=SOCKET_PATH):
+    """Serve helper requests on a Unix socket until cancelled"""
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: _handle_client(reader, writer, allowed_uids), path=path
+    )
+    # Yetki kontrolü SO_PEERCRED ile yapılır; socket herkese açık olabilir
+    os.chmod(path, 0o666)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,48 @@
+"""
+Service Builder signal handlers
+"""
+import logging
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .models import ServiceLog
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_migrate, dispatch_uid='service_builder_servicelog_hypertable')
+def create_servicelog_hypertable(sender, app_config=None, using='default', **kwargs):
+    """Convert ServiceLog into a TimescaleDB hypertable on PostgreSQL installs that have the extension"""
+    if app_config is None or app_config.label != ServiceLog._meta.app_label:
+        return
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    table = ServiceLog._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+            if cursor.fetchone() is None:
+                return
+            cursor.execute(
+                "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = %s",
+                [table]
+            )
+            if cursor.fetchone() is not None:
+                return
+
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            # Hypertable'daki unique index'ler zaman kolonunu içermek zorunda
+            cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{table}_pkey"')
+            cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id, created_at)')
+            cursor.execute(
+                "SELECT create_hypertable(%s, 'created_at', chunk_time_interval => interval '1 day', "
+                "if_not_exists => TRUE, migrate_data => TRUE)",
+                [table]
+            )
+        logger.info("Converted %s to a TimescaleDB hypertable", table)
+    except DatabaseError as e:
+        logger.warning("Could not convert %s to a hypertable: %s", table, e)
@@ -1,9 +1,17 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 app_name = 'service_builder'
 
 urlpatterns = [
+    # Per-service API (status/logs polling) first: patterns are matched in order
+    re_path(
+        r'^api/service/(?P<service_name>[A-Za-z0-9_.@-]{1,100})/(?P<verb>status|logs|control|update|delete)/(?:(?P<arg>[a-z]+)/)?$',
+        views.api_service_dispatch,
+        name='api_service'
+    ),
+    path('api/service-statuses/', views.api_service_statuses, name='api_service_statuses'),
+    
     # Main pages
     path('', views.index, name='index'),
     path('create/', views.create_service, name='create_service'),
@@ -22,11 +30,6 @@ urlpatterns = [
     path('api/suggest-config/', views.api_suggest_config, name='api_suggest_config'),
     path('api/analyze-python/', views.api_analyze_python, name='api_analyze_python'),
     path('api/create-service/', views.api_create_service, name='api_create_service'),
-    path('api/update-service/<str:service_name>/', views.api_update_service, name='api_update_service'),
-    path('api/delete-service/<str:service_name>/', views.api_delete_service, name='api_delete_service'),
-    path('api/service/<str:service_name>/control/<str:action>/', views.api_service_control, name='api_service_control'),
-    path('api/service-status/<str:service_name>/', views.api_service_status, name='api_service_status'),
-    path('api/service-logs/<str:service_name>/', views.api_service_logs, name='api_service_logs'),
     path('api/system-users/', views.api_system_users, name='api_system_users'),
     path('api/network-interfaces/', views.api_network_interfaces, name='api_network_interfaces'),
     path('api/service-managers/', views.api_service_managers, name='api_service_managers'),
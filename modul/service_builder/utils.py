@@ -2,26 +2,80 @@
 Service Builder utility functions
 Linux systemd service management utilities
 """
+import asyncio
+import atexit
 import os
 import subprocess
 import socket
+import stat
 import psutil
 import pwd
 import grp
+import glob
 import logging
+import mmap
 import re
+import select
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
 from pathlib import Path
+from django.db import connection
+from django.utils import timezone
 from .models import ServiceLog
+from . import privhelper
+
+# Optional: systemd D-Bus client (fork/exec'siz systemctl işlemleri için)
+try:
+    from pystemd.dbuslib import DBus
+    from pystemd.systemd1 import Manager as SystemdManager
+    PYSTEMD_AVAILABLE = True
+except ImportError:
+    PYSTEMD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Bu modüldeki subprocess çağrıları shell=True, preexec_fn, cwd veya start_new_session
+# kullanmaz: CPython (3.10+, Linux) bu durumda fork() yerine vfork() ile exec eder ve
+# büyük Django worker'larının sayfa tablolarını kopyalamaz. Yeni çağrılar da bu kurala uymalı.
+
+# ServiceLog yazımları buffer'lanır ve toplu INSERT ile flush edilir
+_LOG_FLUSH_THRESHOLD = 50
+_LOG_FLUSH_INTERVAL = 2.0  # seconds
+_LOG_COPY_THRESHOLD = 500  # PostgreSQL'de bu boyuttan büyük batch'ler COPY ile yazılır
+_log_buffer = deque()
+_log_lock = threading.Lock()
+_log_flush_timer = None
+
+# systemd/init script adları için izin verilen karakterler (api/service/<name>/ URL deseniyle aynı)
+_SERVICE_NAME_RE = re.compile(r'[A-Za-z0-9_.@-]{1,100}')
+
+
+def is_valid_service_name(service_name):
+    """True if the name is safe to pass to systemctl/service/rc-service"""
+    return isinstance(service_name, str) and _SERVICE_NAME_RE.fullmatch(service_name) is not None
+
+
+def _invalid_name_error(service_name):
+    return f"Invalid service name: {service_name!r}"
+
+
+def _invalid_name_status(service_name):
+    return {'status': 'error', 'message': _invalid_name_error(service_name)}
+
+
 # Service manager detection and operations
+# Init sistemi process ömrü boyunca değişmez; sonuç cache'lenir (yeniden tespit için cache_clear())
+@lru_cache(maxsize=1)
 def detect_service_manager():
-    """Detect available service manager on the system"""
+    """Detect available service managers on the system (cached)"""
     service_managers = []
     
     # Check for systemd
-    if subprocess.run(['which', 'systemctl'], capture_output=True).returncode == 0:
+    if shutil.which('systemctl'):
         service_managers.append('systemd')
     
     # Check for sysvinit
@@ -29,21 +83,22 @@ def detect_service_manager():
         service_managers.append('sysvinit')
     
     # Check for upstart
-    if subprocess.run(['which', 'initctl'], capture_output=True).returncode == 0:
+    if shutil.which('initctl'):
         service_managers.append('upstart')
     
     # Check for openrc
-    if subprocess.run(['which', 'rc-service'], capture_output=True).returncode == 0:
+    if shutil.which('rc-service'):
         service_managers.append('openrc')
     
     # Check for runit
-    if subprocess.run(['which', 'sv'], capture_output=True).returncode == 0:
+    if shutil.which('sv'):
         service_managers.append('runit')
     
-    return service_managers
+    return tuple(service_managers)
 
+@lru_cache(maxsize=1)
 def get_primary_service_manager():
-    """Get the primary service manager (prefer systemd)"""
+    """Get the primary service manager (prefer systemd, cached)"""
     managers = detect_service_manager()
     
     # Priority order: systemd > openrc > upstart > sysvinit > runit
@@ -55,6 +110,23 @@ def get_primary_service_manager():
     
     return managers[0] if managers else 'unknown'
 
+
+def refresh_service_manager_cache():
+    """Forget the memoized service manager probe (e.g. after installing an init system)"""
+    detect_service_manager.cache_clear()
+    get_primary_service_manager.cache_clear()
+
+# Async view'lardan çağrılan bloklayan subprocess işleri için sınırlı, paylaşılan pool
+_SUBPROCESS_MAX_WORKERS = 16
+_subprocess_pool = ThreadPoolExecutor(max_workers=_SUBPROCESS_MAX_WORKERS, thread_name_prefix='service-builder')
+
+
+async def run_blocking(func, *args):
+    """Run blocking (subprocess-bound, no ORM) work off the event loop in the shared pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_subprocess_pool, partial(func, *args))
+
+
 # Service manager operations
 class ServiceManager:
     """Abstract service manager operations"""
@@ -62,97 +134,224 @@ class ServiceManager:
     @staticmethod
     def create_service(service_config, manager_type=None):
         """Create service using the specified manager"""
+        if not is_valid_service_name(service_config.name):
+            return False, _invalid_name_error(service_config.name)
         if manager_type is None:
             manager_type = get_primary_service_manager()
         
-        if manager_type == 'systemd':
-            return create_systemd_service(service_config)
-        elif manager_type == 'sysvinit':
-            return create_sysvinit_service(service_config)
-        elif manager_type == 'upstart':
-            return create_upstart_service(service_config)
-        elif manager_type == 'openrc':
-            return create_openrc_service(service_config)
-        elif manager_type == 'runit':
-            return create_runit_service(service_config)
-        else:
+        func = _CREATE_HANDLERS.get(manager_type)
+        if func is None:
             return False, f"Unsupported service manager: {manager_type}"
+        return func(service_config)
     
     @staticmethod
     def update_service(service_config, manager_type=None):
         """Update service using the specified manager"""
+        if not is_valid_service_name(service_config.name):
+            return False, _invalid_name_error(service_config.name)
         if manager_type is None:
             manager_type = get_primary_service_manager()
         
-        if manager_type == 'systemd':
-            return update_systemd_service(service_config)
-        elif manager_type == 'sysvinit':
-            return update_sysvinit_service(service_config)
-        elif manager_type == 'upstart':
-            return update_upstart_service(service_config)
-        elif manager_type == 'openrc':
-            return update_openrc_service(service_config)
-        elif manager_type == 'runit':
-            return update_runit_service(service_config)
-        else:
+        func = _UPDATE_HANDLERS.get(manager_type)
+        if func is None:
             return False, f"Unsupported service manager: {manager_type}"
+        return func(service_config)
     
     @staticmethod
     def delete_service(service_name, manager_type=None):
         """Delete service using the specified manager"""
+        if not is_valid_service_name(service_name):
+            return False, _invalid_name_error(service_name)
         if manager_type is None:
             manager_type = get_primary_service_manager()
         
-        if manager_type == 'systemd':
-            return delete_systemd_service(service_name)
-        elif manager_type == 'sysvinit':
-            return delete_sysvinit_service(service_name)
-        elif manager_type == 'upstart':
-            return delete_upstart_service(service_name)
-        elif manager_type == 'openrc':
-            return delete_openrc_service(service_name)
-        elif manager_type == 'runit':
-            return delete_runit_service(service_name)
-        else:
+        func = _DELETE_HANDLERS.get(manager_type)
+        if func is None:
             return False, f"Unsupported service manager: {manager_type}"
+        try:
+            return func(service_name)
+        finally:
+            invalidate_service_status(service_name)
     
     @staticmethod
     def get_service_status(service_name, manager_type=None):
         """Get service status using the specified manager"""
+        if not is_valid_service_name(service_name):
+            return _invalid_name_status(service_name)
         if manager_type is None:
             manager_type = get_primary_service_manager()
         
-        if manager_type == 'systemd':
-            return get_systemd_service_status(service_name)
-        elif manager_type == 'sysvinit':
-            return get_sysvinit_service_status(service_name)
-        elif manager_type == 'upstart':
-            return get_upstart_service_status(service_name)
-        elif manager_type == 'openrc':
-            return get_openrc_service_status(service_name)
-        elif manager_type == 'runit':
-            return get_runit_service_status(service_name)
-        else:
+        func = _STATUS_HANDLERS.get(manager_type)
+        if func is None:
             return {'status': 'unknown', 'message': f'Unsupported service manager: {manager_type}'}
+        if manager_type == 'systemd':
+            return func(service_name)
+        
+        # service/rc-service sorguları da aynı kısa TTL'li cache'i paylaşır (systemd kendi içinde cache'ler)
+        now = time.monotonic()
+        cached = _cached_service_status(service_name, now)
+        if cached is not None:
+            return cached
+        return _store_service_status(service_name, now, func(service_name))
+    
+    @staticmethod
+    def get_service_statuses(service_names, manager_type=None):
+        """Get statuses of several services (one systemctl call on systemd)"""
+        service_names = [name for name in service_names if is_valid_service_name(name)]
+        if manager_type is None:
+            manager_type = get_primary_service_manager()
+        
+        if manager_type == 'systemd':
+            return get_systemd_statuses(service_names)
+        
+        # Diğer yöneticilerin CLI'ları tek seferde birden çok servis kabul etmez;
+        # servis başına sorgular paralel çalıştırılır
+        names = list(dict.fromkeys(service_names))
+        if len(names) <= 1:
+            return {name: ServiceManager.get_service_status(name, manager_type) for name in names}
+        futures = {
+            name: _subprocess_pool.submit(ServiceManager.get_service_status, name, manager_type)
+            for name in names
+        }
+        statuses = {}
+        for name, future in futures.items():
+            # Çağıran zaten pool thread'inde olabilir (run_blocking); henüz başlamamış
+            # işleri burada çalıştırmak pool dolduğunda kilitlenmeyi önler
+            if future.cancel():
+                statuses[name] = ServiceManager.get_service_status(name, manager_type)
+            else:
+                statuses[name] = future.result()
+        return statuses
     
     @staticmethod
     def control_service(service_name, action, manager_type=None):
         """Control service using the specified manager"""
+        if not is_valid_service_name(service_name):
+            return False, _invalid_name_error(service_name)
         if manager_type is None:
             manager_type = get_primary_service_manager()
         
-        if manager_type == 'systemd':
-            return control_systemd_service(service_name, action)
-        elif manager_type == 'sysvinit':
-            return control_sysvinit_service(service_name, action)
-        elif manager_type == 'upstart':
-            return control_upstart_service(service_name, action)
-        elif manager_type == 'openrc':
-            return control_openrc_service(service_name, action)
-        elif manager_type == 'runit':
-            return control_runit_service(service_name, action)
-        else:
+        func = _CONTROL_HANDLERS.get(manager_type)
+        if func is None:
             return False, f"Unsupported service manager: {manager_type}"
+        try:
+            return func(service_name, action)
+        finally:
+            invalidate_service_status(service_name)
+    
+    @staticmethod
+    async def aget_service_status(service_name, manager_type=None):
+        """Async get_service_status (for async views)"""
+        if not is_valid_service_name(service_name):
+            return _invalid_name_status(service_name)
+        if manager_type is None:
+            manager_type = get_primary_service_manager()
+        
+        func = _ASYNC_STATUS_HANDLERS.get(manager_type)
+        if func is None:
+            func = _STATUS_HANDLERS.get(manager_type)
+            if func is None:
+                return {'status': 'unknown', 'message': f'Unsupported service manager: {manager_type}'}
+            func = partial(run_blocking, func)
+        if manager_type == 'systemd':
+            return await func(service_name)
+        
+        now = time.monotonic()
+        cached = _cached_service_status(service_name, now)
+        if cached is not None:
+            return cached
+        return _store_service_status(service_name, now, await func(service_name))
+    
+    @staticmethod
+    async def acontrol_service(service_name, action, manager_type=None):
+        """Async control_service (for async views)"""
+        if not is_valid_service_name(service_name):
+            return False, _invalid_name_error(service_name)
+        if manager_type is None:
+            manager_type = get_primary_service_manager()
+        
+        func = _ASYNC_CONTROL_HANDLERS.get(manager_type)
+        if func is None:
+            func = _CONTROL_HANDLERS.get(manager_type)
+            if func is None:
+                return False, f"Unsupported service manager: {manager_type}"
+            func = partial(run_blocking, func)
+        try:
+            return await func(service_name, action)
+        finally:
+            invalidate_service_status(service_name)
+
+
+def write_privileged_file(path, content, mode=0o644, then=None):
+    """Write a root-owned file, optionally running `then` (argv) afterwards; returns (success, error)"""
+    if os.geteuid() == 0:
+        try:
+            Path(path).write_text(content)
+            os.chmod(path, mode)
+        except OSError as e:
+            return False, str(e)
+        if then:
+            result = subprocess.run(then, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                return False, result.stderr.decode(errors='replace')
+        return True, ''
+    
+    # Path, mod ve takip komutu shell'e argüman olarak geçilir, komut metnine gömülmez;
+    # yazma + takip komutu tek sudo çağrısında çalışır
+    script = 'cat > "$1" && chmod "$2" "$1"'
+    if then:
+        script += ' && shift 2 && exec "$@"'
+    # İçerik bytes olarak stdin'e verilir; stdout okunmaz, stderr sadece hata durumunda decode edilir
+    result = subprocess.run(
+        ['sudo', 'sh', '-c', script, 'sh', path, format(mode, 'o'), *(then or ())],
+        input=content.encode(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        return False, result.stderr.decode(errors='replace')
+    return True, ''
+
+
+def remove_privileged_files(paths):
+    """Remove root-owned files (missing ones are ignored); returns (success, error)"""
+    if not paths:
+        return True, ''
+    
+    if os.geteuid() == 0:
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                return False, str(e)
+        return True, ''
+    
+    # Tüm yollar tek bir `sudo rm` çağrısına argv olarak verilir
+    result = subprocess.run(['sudo', 'rm', '-f', '--', *paths], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        return False, result.stderr.decode(errors='replace')
+    return True, ''
+
+
+# os.access modu -> (owner, group, other) izin bitleri
+_PERMISSION_BITS = {
+    os.R_OK: (stat.S_IRUSR, stat.S_IRGRP, stat.S_IROTH),
+    os.X_OK: (stat.S_IXUSR, stat.S_IXGRP, stat.S_IXOTH),
+}
+
+
+def _stat_allows(st, mode):
+    """os.access-style permission check on an existing stat result"""
+    owner_bit, group_bit, other_bit = _PERMISSION_BITS[mode]
+    uid = os.geteuid()
+    if uid == 0:
+        # root: okuma her zaman serbest, çalıştırma için herhangi bir x biti yeterli
+        return mode == os.R_OK or bool(st.st_mode & (owner_bit | group_bit | other_bit))
+    if st.st_uid == uid:
+        return bool(st.st_mode & owner_bit)
+    if st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+        return bool(st.st_mode & group_bit)
+    return bool(st.st_mode & other_bit)
 
 
 def validate_application_path(app_path, app_type='normal'):
@@ -164,17 +363,24 @@ def validate_application_path(app_path, app_type='normal'):
         app_path = app_path.strip().strip('"\'')
         app_path = os.path.abspath(app_path)
         
-        # Check if file exists
-        if not os.path.exists(app_path):
+        # Check if file exists (tek stat; izinler st_mode üzerinden kontrol edilir)
+        try:
+            st = os.stat(app_path)
+        except FileNotFoundError:
             return False, f"File not found: {app_path}", None
         
+        if not stat.S_ISREG(st.st_mode):
+            return False, f"Not a regular file: {app_path}", None
+        
         # Check if file is readable
-        if not os.access(app_path, os.R_OK):
+        if not _stat_allows(st, os.R_OK):
             return False, f"No read permission: {app_path}", None
         
+        executable = _stat_allows(st, os.X_OK)
+        
         # For Python files, check if executable or needs interpreter
         if app_path.endswith('.py'):
-            if os.access(app_path, os.X_OK):
+            if executable:
                 return True, "Python file is executable", f'"{app_path}"'
             else:
                 # Find Python interpreter
@@ -185,7 +391,7 @@ def validate_application_path(app_path, app_type='normal'):
                     return False, "Python interpreter not found", None
         else:
             # Check if file is executable
-            if os.access(app_path, os.X_OK):
+            if executable:
                 return True, "File is executable", f'"{app_path}"'
             else:
                 return False, f"File is not executable: {app_path}", None
@@ -195,18 +401,25 @@ def validate_application_path(app_path, app_type='normal'):
         return False, f"Path validation error: {str(e)}", None
 
 
+# Bulunan interpreter process ömrü boyunca cache'lenir; bulunamazsa her çağrıda yeniden aranır
+_python_interpreter = None
+
+
 def find_python_interpreter():
-    """Find Python interpreter path"""
+    """Find Python interpreter path (cached for the process lifetime once found)"""
+    global _python_interpreter
+    if _python_interpreter is None:
+        _python_interpreter = _search_python_interpreter()
+    return _python_interpreter
+
+
+def _search_python_interpreter():
     try:
-        # Try python3 first
-        result = subprocess.run(['which', 'python3'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout.strip()
-        
-        # Try python
-        result = subprocess.run(['which', 'python'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout.strip()
+        # Try python3 first, then python (PATH scan without spawning 'which')
+        for name in ('python3', 'python'):
+            path = shutil.which(name)
+            if path:
+                return path
         
         # Try common paths
         common_paths = [
@@ -227,9 +440,55 @@ def find_python_interpreter():
         return None
 
 
+# /proc/net/tcp{,6} LISTEN soketlerinin port snapshot'ı: (monotonic timestamp, frozenset)
+_LISTENING_PORTS_TTL = 1.0  # seconds
+_listening_ports_cache = (0.0, None)
+_TCP_LISTEN_STATE = '0A'
+
+
+def _listening_ports():
+    """TCP ports with a listening socket, from /proc/net (cached ~1s); None if unavailable"""
+    global _listening_ports_cache
+    cached_at, ports = _listening_ports_cache
+    if ports is not None and time.monotonic() - cached_at < _LISTENING_PORTS_TTL:
+        return ports
+    
+    found = set()
+    try:
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table) as f:
+                    next(f, None)  # header
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) > 3 and fields[3] == _TCP_LISTEN_STATE:
+                            found.add(int(fields[1].rpartition(':')[2], 16))
+            except FileNotFoundError:
+                continue
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading listening ports: {e}")
+        return None
+    ports = frozenset(found)
+    _listening_ports_cache = (time.monotonic(), ports)
+    return ports
+
+
 def check_port_availability(port):
-    """Check if port is available"""
+    """Check if port is available (can be bound)"""
     try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(('0.0.0.0', port))
+                return True
+            except PermissionError:
+                # Privileged port and not root: bind can't tell, check the kernel's listening sockets
+                pass
+            except OSError:
+                return False
+        listening = _listening_ports()
+        if listening is not None:
+            return port not in listening
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
             sock.settimeout(1)
             result = sock.connect_ex(('localhost', port))
@@ -273,45 +532,64 @@ def suggest_service_config(app_path, app_type='normal'):
         return suggestions
 
 
+# Port/host patterns for analyze_python_file, in priority order.
+# Bytes patterns: kaynak dosya decode edilmeden taranır (desenler ASCII)
+# `.run(... port=N)`, `PORT = N`, `.run(... host='x')` ve `HOST = 'x'` desenleri
+# IGNORECASE altında ilk desenin alt kümesi olduğundan hiçbir zaman seçilemez; çıkarıldı
+_PORT_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    rb'port\s*=\s*(\d+)',
+    rb'\.run\(.*:(\d+)',
+    rb'listen\(.*?(\d+)\)',
+)]
+
+_HOST_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    rb'host\s*=\s*[\'"](.+?)[\'"]',
+    rb'listen\([\'"](.+?)[\'"]',
+)]
+
+
+_ANALYZE_MMAP_THRESHOLD = 1024 * 1024  # bytes
+
+
+@lru_cache(maxsize=128)
+def _scan_python_file(file_path, mtime_ns, size):
+    """Port/host found in a Python file; cached per (path, mtime_ns, size) so unchanged files aren't rescanned"""
+    port = None
+    host = None
+    
+    with open(file_path, 'rb') as f:
+        # Büyük dosyalarda mmap: sadece taranan sayfalar belleğe alınır
+        if size >= _ANALYZE_MMAP_THRESHOLD:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            content = f.read()
+        
+        try:
+            # Find port
+            for pattern in _PORT_PATTERNS:
+                match = pattern.search(content)
+                if match:
+                    port = int(match.group(1))
+                    break
+            
+            # Find host
+            for pattern in _HOST_PATTERNS:
+                match = pattern.search(content)
+                if match:
+                    host = match.group(1).decode('utf-8', errors='replace')
+                    break
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+    
+    return port, host
+
+
 def analyze_python_file(file_path):
     """Analyze Python file for port and host configuration"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        port = None
-        host = None
-        
-        # Port patterns
-        port_patterns = [
-            r'port\s*=\s*(\d+)',
-            r'\.run\(.*port\s*=\s*(\d+)',
-            r'\.run\(.*:(\d+)',
-            r'PORT\s*=\s*(\d+)',
-            r'listen\(.*?(\d+)\)',
-        ]
-        
-        # Host patterns
-        host_patterns = [
-            r'host\s*=\s*[\'"](.+?)[\'"]',
-            r'\.run\(.*host\s*=\s*[\'"](.+?)[\'"]',
-            r'HOST\s*=\s*[\'"](.+?)[\'"]',
-            r'listen\([\'"](.+?)[\'"]',
-        ]
-        
-        # Find port
-        for pattern in port_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                port = int(match.group(1))
-                break
-        
-        # Find host
-        for pattern in host_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                host = match.group(1)
-                break
+        st = os.stat(file_path)
+        port, host = _scan_python_file(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
         
         return {
             'port': port,
@@ -324,124 +602,241 @@ def analyze_python_file(file_path):
         return {'port': None, 'host': None, 'available_hosts': []}
 
 
+# (monotonic timestamp, ips) - arka arkaya gelen analiz istekleri için kısa TTL cache
+_LOCAL_IPS_TTL = 5.0  # seconds
+_local_ips_cache = (0.0, None)
+
+
 def get_local_ips():
-    """Get local IP addresses"""
+    """Get local IP addresses (cached for a few seconds)"""
+    global _local_ips_cache
+    cached_at, cached_ips = _local_ips_cache
+    if cached_ips is not None and time.monotonic() - cached_at < _LOCAL_IPS_TTL:
+        return list(cached_ips)
+    
     ips = []
     try:
-        for interface in psutil.net_if_addrs():
-            for addr in psutil.net_if_addrs()[interface]:
+        for interface, addrs in psutil.net_if_addrs().items():
+            for addr in addrs:
                 if addr.family == socket.AF_INET and not addr.address.startswith('127.'):
                     ips.append(addr.address)
     except Exception as e:
         logger.error(f"Error getting local IPs: {e}")
+        return ips
+    _local_ips_cache = (time.monotonic(), tuple(ips))
     return ips
 
 
+def _render_systemd_unit(service_config):
+    """Render the systemd unit file content for a service configuration"""
+    service_name = service_config.name
+    
+    optional_lines = ''
+    # Add working directory if specified
+    if service_config.working_directory:
+        optional_lines += f"WorkingDirectory={service_config.working_directory}\n"
+    
+    # Add environment variables (save() sırasında parse edilmiş JSON kolonundan; yorum satırları atlanmış)
+    for key, value in service_config.environment_vars_dict.items():
+        if key:
+            optional_lines += f"Environment={key}={value}\n"
+    
+    # Add port and host environment variables
+    if service_config.port:
+        optional_lines += f"Environment=PORT={service_config.port}\n"
+    if service_config.host:
+        optional_lines += f"Environment=HOST={service_config.host}\n"
+    
+    # ExecStart
+    if service_config.interpreter:
+        exec_start = f'{service_config.interpreter} "{service_config.application_path}"'
+    else:
+        exec_start = f'"{service_config.application_path}"'
+    
+    return (
+        f"[Unit]\n"
+        f"Description={service_config.description or service_name}\n"
+        f"After=network.target\n"
+        f"\n"
+        f"[Service]\n"
+        f"Type=simple\n"
+        f"User={service_config.user}\n"
+        f"{optional_lines}"
+        f"ExecStart={exec_start}\n"
+        f"Restart={service_config.restart_policy}\n"
+        f"RestartSec=5\n"
+        f"\n"
+        f"[Install]\n"
+        f"WantedBy=multi-user.target"
+    )
+
+
+def _unit_file_matches(service_file_path, content):
+    """True if the unit file on disk already has exactly this content"""
+    try:
+        with open(service_file_path, 'r', encoding='utf-8') as f:
+            return f.read() == content
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+# Kalıcı D-Bus bağlantısı (lazy); sd-bus thread-safe olmadığından çağrılar kilitlenir
+_systemd_dbus_manager = None
+_systemd_dbus_lock = threading.Lock()
+
+# systemctl verb -> org.freedesktop.systemd1.Manager çağrıları.
+# start/stop/restart (ve enable --now) burada yok: StartUnit vb. job kuyruğa alınınca döner,
+# systemctl ise job'un bitmesini bekler ve unit başarısızsa hata verir
+_SYSTEMD_DBUS_VERBS = {
+    'daemon-reload': lambda manager, unit: manager.Reload(),
+    'enable': lambda manager, unit: (manager.EnableUnitFiles([unit], False, True), manager.Reload()),
+    'disable': lambda manager, unit: (manager.DisableUnitFiles([unit], False), manager.Reload()),
+    'reenable': lambda manager, unit: (manager.ReenableUnitFiles([unit], False, True), manager.Reload()),
+}
+
+
+def _systemctl_via_dbus(args):
+    """Run a systemctl verb over the persistent D-Bus connection; returns False if unavailable"""
+    global _systemd_dbus_manager
+    # Manager metodları yetki ister; root değilsek sudo systemctl yoluna düşülür
+    if not PYSTEMD_AVAILABLE or os.geteuid() != 0:
+        return False
+    
+    handler = _SYSTEMD_DBUS_VERBS.get(args[0]) if args else None
+    if handler is None or '--now' in args:
+        return False
+    unit = args[1].encode() if len(args) > 1 else None
+    
+    with _systemd_dbus_lock:
+        try:
+            if _systemd_dbus_manager is None:
+                bus = DBus()
+                bus.open()
+                _systemd_dbus_manager = SystemdManager(bus=bus, _autoload=True)
+            handler(_systemd_dbus_manager.Manager, unit)
+            return True
+        except Exception as e:
+            # Bağlantı bir sonraki çağrıda yeniden kurulur
+            _systemd_dbus_manager = None
+            logger.warning(f"systemd D-Bus call failed, falling back to systemctl: {e}")
+            return False
+
+
+def _systemctl(*args):
+    """Run a systemctl command (D-Bus as root, privileged helper, otherwise sudo); returns (success, error)"""
+    if _systemctl_via_dbus(args):
+        return True, ''
+    helper_result = privhelper.systemctl(*args)
+    if helper_result is not None:
+        returncode, stderr = helper_result
+        return returncode == 0, stderr
+    result = subprocess.run(['sudo', 'systemctl', *args], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        return False, result.stderr.decode(errors='replace')
+    return True, ''
+
+
+async def _run_command_async(*cmd):
+    """Run a command without blocking the event loop; returns (returncode, stdout, stderr)"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate()
+    return proc.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+
+
+async def _asystemctl(*args):
+    """Async _systemctl; returns (success, error)"""
+    # D-Bus çağrıları bloklar ve thread kilidi alır; event loop dışında çalıştırılır
+    # (D-Bus yolu kullanılamıyorsa thread'e geçiş maliyeti de ödenmez)
+    if PYSTEMD_AVAILABLE and os.geteuid() == 0 and await run_blocking(_systemctl_via_dbus, args):
+        return True, ''
+    helper_result = await privhelper.asystemctl(*args)
+    if helper_result is not None:
+        returncode, stderr = helper_result
+        return returncode == 0, stderr
+    returncode, _stdout, stderr = await _run_command_async('sudo', 'systemctl', *args)
+    return returncode == 0, stderr
+
+
 def create_systemd_service(service_config):
     """Create systemd service file with proper sudo permissions"""
+    if not is_valid_service_name(service_config.name):
+        return False, _invalid_name_error(service_config.name)
     try:
         service_name = service_config.name
         service_file_path = f"/etc/systemd/system/{service_name}.service"
         
-        # Build service content
-        service_content = [
-            "[Unit]",
-            f"Description={service_config.description or service_name}",
-            "After=network.target",
-            "",
-            "[Service]",
-            "Type=simple",
-            f"User={service_config.user}"
-        ]
-        
-        # Add working directory if specified
-        if service_config.working_directory:
-            service_content.append(f"WorkingDirectory={service_config.working_directory}")
-        
-        # Add environment variables
-        if service_config.environment_vars:
-            for line in service_config.environment_vars.split('\n'):
-                if '=' in line:
-                    service_content.append(f"Environment={line.strip()}")
-        
-        # Add port and host environment variables
-        if service_config.port:
-            service_content.append(f"Environment=PORT={service_config.port}")
-        if service_config.host:
-            service_content.append(f"Environment=HOST={service_config.host}")
-        
-        # Add ExecStart
-        if service_config.interpreter:
-            service_content.append(f'ExecStart={service_config.interpreter} "{service_config.application_path}"')
-        else:
-            service_content.append(f'ExecStart="{service_config.application_path}"')
-        
-        # Add restart policy
-        service_content.extend([
-            f"Restart={service_config.restart_policy}",
-            "RestartSec=5",
-            "",
-            "[Install]",
-            "WantedBy=multi-user.target"
-        ])
-        
-        # Create service content as string
-        service_content_str = '\n'.join(service_content)
-        
-        # Write service file using sudo
-        write_result = subprocess.run([
-            'sudo', 'tee', service_file_path
-        ], input=service_content_str, text=True, capture_output=True)
-        
-        if write_result.returncode != 0:
-            return False, f"Failed to write service file: {write_result.stderr}"
-        
-        # Set permissions using sudo
-        chmod_result = subprocess.run([
-            'sudo', 'chmod', '644', service_file_path
-        ], capture_output=True, text=True)
+        service_content_str = _render_systemd_unit(service_config)
         
-        if chmod_result.returncode != 0:
-            return False, f"Failed to set permissions: {chmod_result.stderr}"
-        
-        # Reload systemd and enable service using sudo
-        daemon_reload = subprocess.run([
-            'sudo', 'systemctl', 'daemon-reload'
-        ], capture_output=True, text=True)
-        
-        if daemon_reload.returncode != 0:
-            return False, f"Failed to reload systemd: {daemon_reload.stderr}"
-        
-        # Enable service
-        enable_result = subprocess.run([
-            'sudo', 'systemctl', 'enable', f'{service_name}.service'
-        ], capture_output=True, text=True)
-        
-        if enable_result.returncode != 0:
-            return False, f"Failed to enable service: {enable_result.stderr}"
+        # Unit dosyası zaten aynı içerikteyse yazma ve daemon-reload atlanır
+        if not _unit_file_matches(service_file_path, service_content_str):
+            # Write file and set permissions (direct as root, otherwise a single sudo call)
+            write_ok, write_error = write_privileged_file(service_file_path, service_content_str, 0o644)
+            
+            if not write_ok:
+                return False, f"Failed to write service file: {write_error}"
+            
+            # Reload systemd
+            reload_ok, reload_error = _systemctl('daemon-reload')
+            
+            if not reload_ok:
+                return False, f"Failed to reload systemd: {reload_error}"
         
-        # Start service
-        start_result = subprocess.run([
-            'sudo', 'systemctl', 'start', f'{service_name}.service'
-        ], capture_output=True, text=True)
+        # Enable and start service in a single systemctl call
+        enable_ok, enable_error = _systemctl('enable', '--now', f'{service_name}.service')
         
-        if start_result.returncode != 0:
-            return False, f"Failed to start service: {start_result.stderr}"
+        if not enable_ok:
+            return False, f"Failed to enable and start service: {enable_error}"
         
         return True, f"Service {service_name} created and started successfully"
         
     except Exception as e:
         logger.error(f"Error creating systemd service: {e}")
         return False, f"Error creating service: {str(e)}"
+    finally:
+        invalidate_service_status(service_config.name)
+
+
+def _ttl_cache(ttl):
+    """Cache a no-argument function's result for `ttl` seconds; adds .cache_clear()"""
+    def decorator(func):
+        lock = threading.Lock()
+        state = {'expires': 0.0, 'value': None}
+        
+        @wraps(func)
+        def wrapper():
+            with lock:
+                if time.monotonic() < state['expires']:
+                    return list(state['value'])
+            value = func()
+            with lock:
+                state['expires'] = time.monotonic() + ttl
+                state['value'] = tuple(value)
+            return value
+        
+        def cache_clear():
+            with lock:
+                state['expires'] = 0.0
+                state['value'] = None
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
 
 
+# UID < 1000 olsa da servis kullanıcısı olarak listelenen sistem hesapları
+_SERVICE_SYSTEM_USERS = frozenset({'www-data', 'nginx', 'apache'})
+
+
+@_ttl_cache(60)
 def get_system_users():
-    """Get system users for service configuration"""
+    """Get system users for service configuration (cached for 60 seconds)"""
     users = []
     try:
         for user in pwd.getpwall():
             # Only include regular users (UID >= 1000) and system users like www-data
-            if user.pw_uid >= 1000 or user.pw_name in ['www-data', 'nginx', 'apache']:
+            if user.pw_uid >= 1000 or user.pw_name in _SERVICE_SYSTEM_USERS:
                 users.append(user.pw_name)
     except Exception as e:
         logger.error(f"Error getting system users: {e}")
@@ -450,8 +845,9 @@ def get_system_users():
     return users
 
 
+@_ttl_cache(10)
 def get_network_interfaces():
-    """Get network interfaces"""
+    """Get network interfaces (cached for 10 seconds)"""
     interfaces = []
     try:
         for interface, addrs in psutil.net_if_addrs().items():
@@ -467,236 +863,448 @@ def get_network_interfaces():
     return interfaces
 
 
-def log_service_operation(service_name, action, status, message, user='Anonymous', ip_address=None, details=None):
-    """Log service operation"""
+def log_service_operation(service_name, action, status, message, user='Anonymous', ip_address=None, details=None,
+                          flush=False):
+    """Log service operation (buffered, flushed in batches; flush=True writes it immediately)"""
+    global _log_flush_timer
+    entry = {
+        'service_name': service_name,
+        'action': action,
+        'status': status,
+        'message': message,
+        'user': user,
+        'ip_address': ip_address,
+        'details': details,
+        'created_at': timezone.now(),
+    }
+    with _log_lock:
+        _log_buffer.append(entry)
+        should_flush = flush or len(_log_buffer) >= _LOG_FLUSH_THRESHOLD
+        if not should_flush and _log_flush_timer is None:
+            _log_flush_timer = threading.Timer(_LOG_FLUSH_INTERVAL, _flush_service_logs_from_timer)
+            _log_flush_timer.daemon = True
+            _log_flush_timer.start()
+    if should_flush:
+        flush_service_logs()
+
+
+def flush_service_logs():
+    """Write buffered service logs with a single bulk insert"""
+    global _log_flush_timer
+    with _log_lock:
+        if _log_flush_timer is not None:
+            _log_flush_timer.cancel()
+            _log_flush_timer = None
+        entries = list(_log_buffer)
+        _log_buffer.clear()
+    if not entries:
+        return 0
     try:
-        ServiceLog.objects.create(
-            service_name=service_name,
-            action=action,
-            status=status,
-            message=message,
-            user=user,
-            ip_address=ip_address,
-            details=details
-        )
+        if len(entries) >= _LOG_COPY_THRESHOLD and connection.vendor == 'postgresql':
+            ServiceLog.objects.copy_from(entries)
+        else:
+            ServiceLog.bulk_log(entries)
+        return len(entries)
     except Exception as e:
         logger.error(f"Failed to log service operation: {e}")
+        return 0
+
+
+def _flush_service_logs_from_timer():
+    """Timer thread entry point; closes the thread's own DB connection"""
+    try:
+        flush_service_logs()
+    finally:
+        connection.close()
+
+
+# Worker kapanırken/yeniden başlarken buffer'da kalan audit kayıtları kaybolmasın
+atexit.register(flush_service_logs)
+
+
+# Dashboard polling için kısa TTL'li status cache:
+# service_name -> (monotonic timestamp, result, D-Bus sinyalinden mi geldi)
+_STATUS_CACHE_TTL = 3.0  # seconds
+_status_cache = {}
+_status_cache_lock = threading.Lock()
+
+
+# D-Bus watcher aktifken sinyalden gelen girdilerin süresi dolmaz; sorgudan gelenler TTL'lidir
+_status_watcher_alive = threading.Event()
+_status_watcher_started = False
+_SYSTEMD_UNIT_PATH_PREFIX = '/org/freedesktop/systemd1/unit/'
+
+
+def invalidate_service_status(service_name):
+    """Drop the cached status of a service after a state-changing operation"""
+    with _status_cache_lock:
+        _status_cache.pop(service_name, None)
+
+
+def _status_entry_fresh(cached, now):
+    if cached is None:
+        return False
+    if cached[2] and _status_watcher_alive.is_set():
+        return True
+    return now - cached[0] < _STATUS_CACHE_TTL
+
+
+def _put_polled_status(service_name, now, result):
+    """Cache a status queried at `now` unless a newer entry (e.g. a signal) arrived meanwhile.
+    Caller holds _status_cache_lock; returns the result now in the cache."""
+    cached = _status_cache.get(service_name)
+    if cached is not None and cached[0] >= now:
+        return cached[1]
+    _status_cache[service_name] = (now, result, False)
+    return result
+
+
+def _ensure_status_watcher():
+    """Start the systemd D-Bus signal watcher thread once (if pystemd is available)"""
+    global _status_watcher_started
+    if _status_watcher_started or not PYSTEMD_AVAILABLE:
+        return
+    with _status_cache_lock:
+        if _status_watcher_started:
+            return
+        _status_watcher_started = True
+    threading.Thread(target=_watch_systemd_units, name='systemd-status-watcher', daemon=True).start()
+
+
+def _as_str(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _service_name_from_unit(unit):
+    """'nginx.service' -> 'nginx'; None for non-service units"""
+    if unit.endswith('.service'):
+        return unit[:-len('.service')]
+    return None
+
+
+def _on_unit_properties_changed(msg, error=None, userdata=None):
+    msg.process_reply(True)
+    path = _as_str(msg.headers.get('Path') or '')
+    if not path.startswith(_SYSTEMD_UNIT_PATH_PREFIX):
+        return
+    interface, changed, _invalidated = msg.body
+    active_state = changed.get(b'ActiveState', changed.get('ActiveState'))
+    if _as_str(interface) != 'org.freedesktop.systemd1.Unit' or active_state is None:
+        return
+    # Object path'te unit adı _XX hex kaçışlarıyla kodlanır (ör. nginx_2eservice)
+    unit = re.sub(r'_([0-9a-f]{2})', lambda m: chr(int(m.group(1), 16)), path[len(_SYSTEMD_UNIT_PATH_PREFIX):])
+    service_name = _service_name_from_unit(unit)
+    if service_name:
+        with _status_cache_lock:
+            _status_cache[service_name] = (time.monotonic(), _status_from_active_state(_as_str(active_state)), True)
+
+
+def _on_unit_removed(msg, error=None, userdata=None):
+    msg.process_reply(True)
+    service_name = _service_name_from_unit(_as_str(msg.body[0]))
+    if service_name:
+        invalidate_service_status(service_name)
+
+
+def _watch_systemd_units():
+    """Keep the status cache current from systemd signals instead of polling systemctl"""
+    try:
+        with DBus() as bus:
+            bus.match_signal(b'org.freedesktop.systemd1', None, b'org.freedesktop.DBus.Properties',
+                             b'PropertiesChanged', _on_unit_properties_changed, None)
+            bus.match_signal(b'org.freedesktop.systemd1', b'/org/freedesktop/systemd1',
+                             b'org.freedesktop.systemd1.Manager', b'UnitRemoved', _on_unit_removed, None)
+            SystemdManager(bus=bus, _autoload=True).Manager.Subscribe()
+            
+            # Abonelikten önce cache'lenen (TTL'li) girdiler güvenilir değil
+            _clear_status_cache()
+            _status_watcher_alive.set()
+            
+            fd = bus.get_fd()
+            while True:
+                select.select([fd], [], [])
+                bus.process()
+    except Exception as e:
+        logger.warning(f"systemd status watcher stopped, falling back to polling: {e}")
+    finally:
+        _status_watcher_alive.clear()
+        _clear_status_cache()
+
+
+def _cached_service_status(service_name, now):
+    """Cached status dict for a service, or None if missing/expired"""
+    with _status_cache_lock:
+        cached = _status_cache.get(service_name)
+    if _status_entry_fresh(cached, now):
+        return dict(cached[1])
+    return None
+
+
+def _store_service_status(service_name, now, result):
+    if result['status'] != 'error':
+        with _status_cache_lock:
+            result = _put_polled_status(service_name, now, result)
+    return dict(result)
 
 
 def get_service_status(service_name):
-    """Get service status from systemd"""
+    """Get service status from systemd (kept current by D-Bus signals, else cached for a few seconds)"""
+    if not is_valid_service_name(service_name):
+        return _invalid_name_status(service_name)
+    _ensure_status_watcher()
+    now = time.monotonic()
+    cached = _cached_service_status(service_name, now)
+    if cached is not None:
+        return cached
+    return _store_service_status(service_name, now, _query_service_status(service_name))
+
+
+async def aget_service_status(service_name):
+    """Async get_service_status; systemctl runs without blocking the event loop"""
+    if not is_valid_service_name(service_name):
+        return _invalid_name_status(service_name)
+    _ensure_status_watcher()
+    now = time.monotonic()
+    cached = _cached_service_status(service_name, now)
+    if cached is not None:
+        return cached
+    try:
+        returncode, stdout, stderr = await _run_command_async(
+            'systemctl', 'show', '--property=LoadState,ActiveState', f'{service_name}.service'
+        )
+        result = _status_from_properties(stdout, stderr.strip())
+    except Exception as e:
+        result = {'status': 'error', 'message': str(e)}
+    return _store_service_status(service_name, now, result)
+
+
+def _clear_status_cache():
+    with _status_cache_lock:
+        _status_cache.clear()
+
+
+get_service_status.cache_clear = _clear_status_cache
+
+
+def _query_service_status(service_name):
+    """Get service status from systemd (LoadState/ActiveState properties, no journal read)"""
     try:
         result = subprocess.run(
-            ['sudo', 'systemctl', 'status', f'{service_name}.service'],
+            ['systemctl', 'show', '--property=LoadState,ActiveState', f'{service_name}.service'],
             capture_output=True,
             text=True
         )
         
-        if 'Active: active (running)' in result.stdout:
-            return {'status': 'running', 'message': 'Service is running'}
-        elif 'Active: inactive (dead)' in result.stdout:
-            return {'status': 'stopped', 'message': 'Service is stopped'}
-        else:
-            return {'status': 'unknown', 'message': result.stdout}
+        return _status_from_properties(result.stdout, result.stderr.strip())
             
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
 
+def _status_from_properties(output, fallback_message=''):
+    """Map one unit's `systemctl show` KEY=VALUE block to the status dict used by the API"""
+    properties = dict(line.split('=', 1) for line in output.strip().splitlines() if '=' in line)
+    # Var olmayan unit'ler için systemd ActiveState=inactive döner; LoadState ile ayırt edilir
+    if properties.get('LoadState') == 'not-found':
+        return {'status': 'unknown', 'message': 'Service not found'}
+    return _status_from_active_state(properties.get('ActiveState', ''), fallback_message)
+
+
+def _status_from_active_state(active_state, fallback_message=''):
+    """Map a systemd ActiveState value to the status dict used by the API"""
+    if active_state == 'active':
+        return {'status': 'running', 'message': 'Service is running'}
+    elif active_state == 'inactive':
+        return {'status': 'stopped', 'message': 'Service is stopped'}
+    elif active_state == 'failed':
+        return {'status': 'stopped', 'message': 'Service failed'}
+    else:
+        return {'status': 'unknown', 'message': active_state or fallback_message}
+
+
+def get_systemd_statuses(service_names):
+    """Get statuses of several systemd services with a single systemctl call"""
+    _ensure_status_watcher()
+    statuses = {}
+    missing = []
+    now = time.monotonic()
+    with _status_cache_lock:
+        for name in dict.fromkeys(service_names):
+            if not is_valid_service_name(name):
+                statuses[name] = _invalid_name_status(name)
+                continue
+            cached = _status_cache.get(name)
+            if _status_entry_fresh(cached, now):
+                statuses[name] = dict(cached[1])
+            else:
+                missing.append(name)
+    if not missing:
+        return statuses
+    
+    try:
+        result = subprocess.run(
+            ['systemctl', 'show', '--property=LoadState,ActiveState',
+             *(f'{name}.service' for name in missing)],
+            capture_output=True,
+            text=True
+        )
+        # Her unit'in çıktısı boş satırla ayrılır, sıra argüman sırasıyla aynıdır
+        blocks = result.stdout.strip().split('\n\n')
+    except Exception as e:
+        logger.error(f"Error getting service statuses: {e}")
+        blocks = []
+    
+    if len(blocks) != len(missing):
+        # Beklenmeyen çıktı: servis başına sorguya düş
+        for name in missing:
+            statuses[name] = get_service_status(name)
+        return statuses
+    
+    with _status_cache_lock:
+        for name, block in zip(missing, blocks):
+            status = _put_polled_status(name, now, _status_from_properties(block))
+            statuses[name] = dict(status)
+    return statuses
+
+
 def control_service(service_name, action):
     """Control service (start, stop, restart, enable, disable)"""
+    if not is_valid_service_name(service_name):
+        return False, _invalid_name_error(service_name)
     try:
         if action in ['start', 'stop', 'restart', 'enable', 'disable']:
-            result = subprocess.run(
-                ['sudo', 'systemctl', action, f'{service_name}.service'],
-                capture_output=True,
-                text=True
-            )
+            success, error = _systemctl(action, f'{service_name}.service')
             
-            if result.returncode == 0:
+            if success:
                 return True, f"Service {action} successful"
             else:
-                return False, f"Service {action} failed: {result.stderr}"
+                return False, f"Service {action} failed: {error}"
         else:
             return False, f"Invalid action: {action}"
             
     except Exception as e:
         return False, f"Error controlling service: {str(e)}"
+    finally:
+        invalidate_service_status(service_name)
+
+
+async def acontrol_service(service_name, action):
+    """Async control_service (start, stop, restart, enable, disable)"""
+    if not is_valid_service_name(service_name):
+        return False, _invalid_name_error(service_name)
+    try:
+        if action in ['start', 'stop', 'restart', 'enable', 'disable']:
+            success, error = await _asystemctl(action, f'{service_name}.service')
+            
+            if success:
+                return True, f"Service {action} successful"
+            else:
+                return False, f"Service {action} failed: {error}"
+        else:
+            return False, f"Invalid action: {action}"
+            
+    except Exception as e:
+        return False, f"Error controlling service: {str(e)}"
+    finally:
+        invalidate_service_status(service_name)
 
 
 def update_systemd_service(service_config):
     """Update systemd service file"""
+    if not is_valid_service_name(service_config.name):
+        return False, _invalid_name_error(service_config.name)
     try:
         service_name = service_config.name
         service_file_path = f"/etc/systemd/system/{service_name}.service"
         
-        # Stop service first
-        stop_result = subprocess.run(
-            ['systemctl', 'stop', f'{service_name}.service'],
-            capture_output=True,
-            text=True
-        )
-        
-        # Build new service content
-        service_content = [
-            "[Unit]",
-            f"Description={service_config.description or service_name}",
-            "After=network.target",
-            "",
-            "[Service]",
-            "Type=simple",
-            f"User={service_config.user}"
-        ]
-        
-        # Add working directory if specified
-        if service_config.working_directory:
-            service_content.append(f"WorkingDirectory={service_config.working_directory}")
-        
-        # Add environment variables
-        if service_config.environment_vars:
-            for line in service_config.environment_vars.split('\n'):
-                if '=' in line:
-                    service_content.append(f"Environment={line.strip()}")
-        
-        # Add port and host environment variables
-        if service_config.port:
-            service_content.append(f"Environment=PORT={service_config.port}")
-        if service_config.host:
-            service_content.append(f"Environment=HOST={service_config.host}")
-        
-        # Add ExecStart
-        if service_config.interpreter:
-            service_content.append(f'ExecStart={service_config.interpreter} "{service_config.application_path}"')
-        else:
-            service_content.append(f'ExecStart="{service_config.application_path}"')
-        
-        # Add restart policy
-        service_content.extend([
-            f"Restart={service_config.restart_policy}",
-            "RestartSec=5",
-            "",
-            "[Install]",
-            "WantedBy=multi-user.target"
-        ])
+        service_content_str = _render_systemd_unit(service_config)
         
-        # Create service content as string
-        service_content_str = '\n'.join(service_content)
+        # Unit dosyası değişmediyse reload/reenable/restart gereksiz; servis yeniden başlatılmaz
+        if _unit_file_matches(service_file_path, service_content_str):
+            return True, f"Service {service_name} is already up to date"
         
-        # Write updated service file using sudo
-        write_result = subprocess.run([
-            'sudo', 'tee', service_file_path
-        ], input=service_content_str, text=True, capture_output=True)
+        # Write file and set permissions (direct as root, otherwise a single sudo call)
+        write_ok, write_error = write_privileged_file(service_file_path, service_content_str, 0o644)
         
-        if write_result.returncode != 0:
-            return False, f"Failed to update service file: {write_result.stderr}"
-        
-        # Set permissions using sudo
-        chmod_result = subprocess.run([
-            'sudo', 'chmod', '644', service_file_path
-        ], capture_output=True, text=True)
-        
-        if chmod_result.returncode != 0:
-            return False, f"Failed to set permissions: {chmod_result.stderr}"
+        if not write_ok:
+            return False, f"Failed to update service file: {write_error}"
         
         # Reload systemd
-        reload_result = subprocess.run([
-            'sudo', 'systemctl', 'daemon-reload'
-        ], capture_output=True, text=True)
+        reload_ok, reload_error = _systemctl('daemon-reload')
         
-        if reload_result.returncode != 0:
-            return False, f"Failed to reload systemd: {reload_result.stderr}"
+        if not reload_ok:
+            return False, f"Failed to reload systemd: {reload_error}"
         
-        # Enable service
-        enable_result = subprocess.run([
-            'sudo', 'systemctl', 'enable', f'{service_name}.service'
-        ], capture_output=True, text=True)
+        # Re-apply [Install] section (e.g. changed WantedBy)
+        reenable_ok, reenable_error = _systemctl('reenable', f'{service_name}.service')
         
-        if enable_result.returncode != 0:
-            return False, f"Failed to enable service: {enable_result.stderr}"
+        if not reenable_ok:
+            return False, f"Failed to enable service: {reenable_error}"
         
-        # Start service
-        start_result = subprocess.run([
-            'sudo', 'systemctl', 'start', f'{service_name}.service'
-        ], capture_output=True, text=True)
+        # Restart replaces the separate stop + start calls
+        restart_ok, restart_error = _systemctl('restart', f'{service_name}.service')
         
-        if start_result.returncode != 0:
-            return False, f"Failed to start service: {start_result.stderr}"
+        if not restart_ok:
+            return False, f"Failed to restart service: {restart_error}"
         
         return True, f"Service {service_name} updated successfully"
         
     except Exception as e:
         logger.error(f"Error updating systemd service: {e}")
         return False, f"Error updating service: {str(e)}"
+    finally:
+        invalidate_service_status(service_config.name)
 
 
 def delete_systemd_service(service_name):
     """Delete systemd service completely"""
+    if not is_valid_service_name(service_name):
+        return False, _invalid_name_error(service_name)
     try:
         service_file_path = f"/etc/systemd/system/{service_name}.service"
         
         # Stop service first
-        stop_result = subprocess.run(
-            ['sudo', 'systemctl', 'stop', f'{service_name}.service'],
-            capture_output=True,
-            text=True
-        )
+        _systemctl('stop', f'{service_name}.service')
         
         # Disable service
-        disable_result = subprocess.run(
-            ['sudo', 'systemctl', 'disable', f'{service_name}.service'],
-            capture_output=True,
-            text=True
-        )
+        _systemctl('disable', f'{service_name}.service')
         
         # Remove service file
-        remove_result = subprocess.run(
-            ['sudo', 'rm', '-f', service_file_path],
-            capture_output=True,
-            text=True
-        )
+        remove_ok, remove_error = remove_privileged_files([service_file_path])
         
-        if remove_result.returncode != 0:
-            return False, f"Failed to remove service file: {remove_result.stderr}"
+        if not remove_ok:
+            return False, f"Failed to remove service file: {remove_error}"
         
         # Reload systemd
-        reload_result = subprocess.run(
-            ['sudo', 'systemctl', 'daemon-reload'],
-            capture_output=True,
-            text=True
-        )
+        reload_ok, reload_error = _systemctl('daemon-reload')
         
-        if reload_result.returncode != 0:
-            return False, f"Failed to reload systemd: {reload_result.stderr}"
+        if not reload_ok:
+            return False, f"Failed to reload systemd: {reload_error}"
         
         return True, f"Service {service_name} deleted successfully"
         
     except Exception as e:
         logger.error(f"Error deleting systemd service: {e}")
         return False, f"Error deleting service: {str(e)}"
+    finally:
+        invalidate_service_status(service_name)
 
-# SysV Init Service Operations
-def create_sysvinit_service(service_config):
-    """Create SysV init service"""
-    try:
-        service_name = service_config.name
-        service_file_path = f"/etc/init.d/{service_name}"
-        
-        # Create init script content
-        init_script = f"""#!/bin/bash
+# SysV init / OpenRC script templates (str.format_map ile doldurulur; süslü parantezler {{ }} olarak kaçışlıdır)
+_SYSVINIT_SCRIPT_TEMPLATE = """#!/bin/bash
 ### BEGIN INIT INFO
-# Provides:          {service_name}
+# Provides:          {name}
 # Required-Start:    $local_fs $network
 # Required-Stop:     $local_fs $network
 # Default-Start:     2 3 4 5
 # Default-Stop:      0 1 6
-# Short-Description: {service_config.description}
-# Description:       {service_config.description}
+# Short-Description: {description}
+# Description:       {description}
 ### END INIT INFO
 
-SERVICE_NAME="{service_name}"
-SERVICE_USER="{service_config.user}"
-SERVICE_DIR="{service_config.working_directory}"
-SERVICE_CMD="{service_config.application_path}"
+SERVICE_NAME="{name}"
+SERVICE_USER="{user}"
+SERVICE_DIR="{working_directory}"
+SERVICE_CMD="{application_path}"
 
 case "$1" in
     start)
@@ -737,22 +1345,51 @@ case "$1" in
         ;;
 esac
 """
+
+_OPENRC_SCRIPT_TEMPLATE = """#!/sbin/openrc-run
+# Copyright 1999-2019 Gentoo Authors
+# Distributed under the terms of the GNU General Public License v2
+
+description="{description}"
+command="{application_path}"
+command_user="{user}"
+command_background="yes"
+pidfile="/var/run/${{RC_SVCNAME}}.pid"
+start_stop_daemon_args="--chdir {working_directory}"
+
+depend() {{
+    need localmount
+    after localmount
+}}
+"""
+
+
+def _init_script_fields(service_config):
+    """Template fields shared by the SysV init and OpenRC scripts"""
+    return {
+        'name': service_config.name,
+        'description': service_config.description,
+        'user': service_config.user,
+        'working_directory': service_config.working_directory,
+        'application_path': service_config.application_path,
+    }
+
+
+# SysV Init Service Operations
+def create_sysvinit_service(service_config):
+    """Create SysV init service"""
+    try:
+        service_name = service_config.name
+        service_file_path = f"/etc/init.d/{service_name}"
         
-        # Write init script using sudo
-        write_result = subprocess.run([
-            'sudo', 'tee', service_file_path
-        ], input=init_script, text=True, capture_output=True)
-        
-        if write_result.returncode != 0:
-            return False, f"Failed to write init script: {write_result.stderr}"
+        # Create init script content
+        init_script = _SYSVINIT_SCRIPT_TEMPLATE.format_map(_init_script_fields(service_config))
         
-        # Set permissions using sudo
-        chmod_result = subprocess.run([
-            'sudo', 'chmod', '+x', service_file_path
-        ], capture_output=True, text=True)
+        # Write file and set permissions (direct as root, otherwise a single sudo call)
+        write_ok, write_error = write_privileged_file(service_file_path, init_script, 0o755)
         
-        if chmod_result.returncode != 0:
-            return False, f"Failed to set permissions: {chmod_result.stderr}"
+        if not write_ok:
+            return False, f"Failed to write init script: {write_error}"
         
         # Enable service (create symlinks)
         for runlevel in ['2', '3', '4', '5']:
@@ -778,17 +1415,13 @@ def delete_sysvinit_service(service_name):
         # Stop service first
         subprocess.run(['sudo', 'service', service_name, 'stop'], capture_output=True)
         
-        # Remove symlinks
-        for runlevel in ['0', '1', '2', '3', '4', '5', '6']:
-            subprocess.run(['sudo', 'rm', '-f', f'/etc/rc{runlevel}.d/*{service_name}'], capture_output=True)
+        # Remove runlevel symlinks and init script (glob Python tarafında genişletilir)
+        paths = glob.glob(f'/etc/rc[0-6].d/*{glob.escape(service_name)}')
+        paths.append(service_file_path)
+        success, error = remove_privileged_files(paths)
         
-        # Remove init script
-        remove_result = subprocess.run([
-            'sudo', 'rm', '-f', service_file_path
-        ], capture_output=True, text=True)
-        
-        if remove_result.returncode != 0:
-            return False, f"Failed to remove init script: {remove_result.stderr}"
+        if not success:
+            return False, f"Failed to remove init script: {error}"
         
         return True, f"SysV init service {service_name} deleted successfully"
         
@@ -842,46 +1475,16 @@ def create_openrc_service(service_config):
         service_file_path = f"/etc/init.d/{service_name}"
         
         # Create OpenRC init script
-        init_script = f"""#!/sbin/openrc-run
-# Copyright 1999-2019 Gentoo Authors
-# Distributed under the terms of the GNU General Public License v2
-
-description="{service_config.description}"
-command="{service_config.application_path}"
-command_user="{service_config.user}"
-command_background="yes"
-pidfile="/var/run/${{RC_SVCNAME}}.pid"
-start_stop_daemon_args="--chdir {service_config.working_directory}"
-
-depend() {{
-    need localmount
-    after localmount
-}}
-"""
-        
-        # Write init script using sudo
-        write_result = subprocess.run([
-            'sudo', 'tee', service_file_path
-        ], input=init_script, text=True, capture_output=True)
-        
-        if write_result.returncode != 0:
-            return False, f"Failed to write OpenRC script: {write_result.stderr}"
+        init_script = _OPENRC_SCRIPT_TEMPLATE.format_map(_init_script_fields(service_config))
         
-        # Set permissions using sudo
-        chmod_result = subprocess.run([
-            'sudo', 'chmod', '+x', service_file_path
-        ], capture_output=True, text=True)
-        
-        if chmod_result.returncode != 0:
-            return False, f"Failed to set permissions: {chmod_result.stderr}"
-        
-        # Add service to default runlevel
-        add_result = subprocess.run([
-            'sudo', 'rc-update', 'add', service_name, 'default'
-        ], capture_output=True, text=True)
+        # Write file, set permissions and add service to default runlevel (single sudo call)
+        install_ok, install_error = write_privileged_file(
+            service_file_path, init_script, 0o755,
+            then=['rc-update', 'add', service_name, 'default']
+        )
         
-        if add_result.returncode != 0:
-            return False, f"Failed to add service to default runlevel: {add_result.stderr}"
+        if not install_ok:
+            return False, f"Failed to install OpenRC script: {install_error}"
         
         return True, f"OpenRC service {service_name} created successfully"
         
@@ -898,19 +1501,18 @@ def delete_openrc_service(service_name):
     try:
         service_file_path = f"/etc/init.d/{service_name}"
         
-        # Stop service first
-        subprocess.run(['sudo', 'rc-service', service_name, 'stop'], capture_output=True)
-        
-        # Remove from runlevels
-        subprocess.run(['sudo', 'rc-update', 'del', service_name], capture_output=True)
-        
-        # Remove init script
+        # Tek sudo çağrısı: stop (en fazla 10s beklenir) ve rc-update hataları önemsiz,
+        # çıkış kodu yalnızca rm'e aittir. Ad ve yol $1/$2 olarak geçer, script'e gömülmez
         remove_result = subprocess.run([
-            'sudo', 'rm', '-f', service_file_path
-        ], capture_output=True, text=True)
+            'sudo', 'sh', '-c',
+            'timeout 10 rc-service "$1" stop >/dev/null 2>&1; '
+            'rc-update del "$1" >/dev/null 2>&1; '
+            'rm -f -- "$2"',
+            'sh', service_name, service_file_path
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         
         if remove_result.returncode != 0:
-            return False, f"Failed to remove OpenRC script: {remove_result.stderr}"
+            return False, f"Failed to remove OpenRC script: {remove_result.stderr.decode(errors='replace')}"
         
         return True, f"OpenRC service {service_name} deleted successfully"
         
@@ -921,8 +1523,9 @@ def delete_openrc_service(service_name):
 def get_openrc_service_status(service_name):
     """Get OpenRC service status"""
     try:
+        # status sorgusu root gerektirmez; sudo/PAM maliyeti yok
         result = subprocess.run(
-            ['sudo', 'rc-service', service_name, 'status'],
+            ['rc-service', service_name, 'status'],
             capture_output=True,
             text=True
         )
@@ -935,41 +1538,105 @@ def get_openrc_service_status(service_name):
     except Exception as e:
         return {'status': 'error', 'message': f'Error checking status: {str(e)}'}
 
+async def aget_openrc_service_status(service_name):
+    """Async get_openrc_service_status"""
+    try:
+        returncode, _stdout, _stderr = await _run_command_async('rc-service', service_name, 'status')
+        
+        if returncode == 0:
+            return {'status': 'running', 'message': 'Service is running'}
+        else:
+            return {'status': 'stopped', 'message': 'Service is stopped'}
+            
+    except Exception as e:
+        return {'status': 'error', 'message': f'Error checking status: {str(e)}'}
+
+def _openrc_control_command(service_name, action):
+    """rc-service / rc-update argv for a control action, None if unsupported"""
+    if action in ['start', 'stop', 'restart']:
+        return ['sudo', 'rc-service', service_name, action]
+    elif action == 'enable':
+        return ['sudo', 'rc-update', 'add', service_name]
+    elif action == 'disable':
+        return ['sudo', 'rc-update', 'del', service_name]
+    return None
+
 def control_openrc_service(service_name, action):
     """Control OpenRC service"""
     try:
-        if action in ['start', 'stop', 'restart']:
-            result = subprocess.run(
-                ['sudo', 'rc-service', service_name, action],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                return True, f"Service {action} successful"
-            else:
-                return False, f"Service {action} failed: {result.stderr}"
-        elif action in ['enable', 'disable']:
-            if action == 'enable':
-                result = subprocess.run(
-                    ['sudo', 'rc-update', 'add', service_name],
-                    capture_output=True,
-                    text=True
-                )
-            else:
-                result = subprocess.run(
-                    ['sudo', 'rc-update', 'del', service_name],
-                    capture_output=True,
-                    text=True
-                )
-            
-            if result.returncode == 0:
-                return True, f"Service {action} successful"
-            else:
-                return False, f"Service {action} failed: {result.stderr}"
+        cmd = _openrc_control_command(service_name, action)
+        if cmd is None:
+            return False, f"Unsupported action: {action}"
+        
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        
+        if result.returncode == 0:
+            return True, f"Service {action} successful"
         else:
+            return False, f"Service {action} failed: {result.stderr}"
+            
+    except Exception as e:
+        logger.error(f"Error controlling OpenRC service: {e}")
+        return False, f"Error controlling service: {str(e)}"
+
+async def acontrol_openrc_service(service_name, action):
+    """Async control_openrc_service"""
+    try:
+        cmd = _openrc_control_command(service_name, action)
+        if cmd is None:
             return False, f"Unsupported action: {action}"
+        
+        returncode, _stdout, stderr = await _run_command_async(*cmd)
+        
+        if returncode == 0:
+            return True, f"Service {action} successful"
+        else:
+            return False, f"Service {action} failed: {stderr}"
             
     except Exception as e:
         logger.error(f"Error controlling OpenRC service: {e}")
         return False, f"Error controlling service: {str(e)}"
+
+
+# Manager type -> implementation; ServiceManager dispatches through these maps.
+# upstart/runit have no implementation yet and are reported as unsupported.
+_CREATE_HANDLERS = {
+    'systemd': create_systemd_service,
+    'sysvinit': create_sysvinit_service,
+    'openrc': create_openrc_service,
+}
+
+_UPDATE_HANDLERS = {
+    'systemd': update_systemd_service,
+    'sysvinit': update_sysvinit_service,
+    'openrc': update_openrc_service,
+}
+
+_DELETE_HANDLERS = {
+    'systemd': delete_systemd_service,
+    'sysvinit': delete_sysvinit_service,
+    'openrc': delete_openrc_service,
+}
+
+_STATUS_HANDLERS = {
+    'systemd': get_service_status,
+    'sysvinit': get_sysvinit_service_status,
+    'openrc': get_openrc_service_status,
+}
+
+_CONTROL_HANDLERS = {
+    'systemd': control_service,
+    'sysvinit': control_sysvinit_service,
+    'openrc': control_openrc_service,
+}
+
+# Async variants; managers without one run their sync handler in a worker thread
+_ASYNC_STATUS_HANDLERS = {
+    'systemd': aget_service_status,
+    'openrc': aget_openrc_service_status,
+}
+
+_ASYNC_CONTROL_HANDLERS = {
+    'systemd': acontrol_service,
+    'openrc': acontrol_openrc_service,
+}
@@ -1,18 +1,21 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.shortcuts import render, redirect
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db import IntegrityError
 from django.utils.translation import gettext as _
 import json
 import os
-import subprocess
 import socket
 import psutil
 import pwd
 import grp
 import logging
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
 from .models import ServiceTemplate, ServiceLog, ServiceConfiguration
 from .utils import (
@@ -26,26 +29,79 @@ from .utils import (
     get_system_users,
     get_network_interfaces,
     log_service_operation,
+    flush_service_logs,
     ServiceManager,
     detect_service_manager,
-    get_primary_service_manager
+    get_primary_service_manager,
+    refresh_service_manager_cache,
+    is_valid_service_name,
+    get_service_status,
+    aget_service_status,
+    run_blocking,
+    control_service,
+    acontrol_service
 )
 
+# Optional fast JSON parser/serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError, json.JSONDecodeError'ın alt sınıfı; mevcut except blokları geçerli
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _json_response(data, status=200):
+    """JsonResponse equivalent that serializes with orjson when available (polling endpoints)"""
+    if ORJSON_AVAILABLE:
+        return HttpResponse(orjson.dumps(data), content_type='application/json', status=status)
+    return JsonResponse(data, status=status)
+
+
+@dataclass
+class CreateServiceRequest:
+    """api_create_service request body; unknown keys are ignored"""
+    name: str = ''
+    application_path: str = ''
+    user: str = ''
+    description: str = ''
+    service_type: str = 'normal'
+    interpreter: str = ''
+    working_directory: str = ''
+    port: int | None = None
+    host: str = '0.0.0.0'
+    restart_policy: str = 'always'
+    environment_vars: str = ''
+
+    REQUIRED_FIELDS = ('name', 'application_path', 'user')
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field.name: data[field.name] for field in fields(cls) if field.name in data})
+
+
+# List page sizes
+_SERVICES_PER_PAGE = 50
+_LOGS_PER_PAGE = 50
+
 
 @login_required
 def index(request):
     """Service Builder main page"""
     try:
         # Get recent service configurations
-        recent_services = ServiceConfiguration.objects.filter(is_active=True).order_by('-created_at')[:5]
+        recent_services = ServiceConfiguration.objects.for_list().filter(is_active=True).order_by('-created_at')[:5]
         
         # Get service templates
-        templates = ServiceTemplate.objects.filter(is_active=True).order_by('-created_at')[:5]
+        templates = ServiceTemplate.objects.for_list().filter(is_active=True).order_by('-created_at')[:5]
         
         # Get recent logs
-        recent_logs = ServiceLog.objects.all().order_by('-created_at')[:10]
+        flush_service_logs()
+        recent_logs = ServiceLog.objects.for_list().order_by('-created_at')[:10]
         
         context = {
             'page_title': _('Service Builder'),
@@ -96,7 +152,7 @@ def create_service(request):
 def templates(request):
     """Service templates page"""
     try:
-        templates = ServiceTemplate.objects.all().order_by('-created_at')
+        templates = ServiceTemplate.objects.for_list().order_by('-created_at')
         
         context = {
             'page_title': _('Service Templates'),
@@ -116,12 +172,14 @@ def templates(request):
 def services(request):
     """Services management page"""
     try:
-        services = ServiceConfiguration.objects.all().order_by('-created_at')
+        services = ServiceConfiguration.objects.for_list().order_by('-created_at')
+        page_obj = Paginator(services, _SERVICES_PER_PAGE).get_page(request.GET.get('page'))
         
         context = {
             'page_title': _('Services'),
             'active_module': 'service_builder',
-            'services': services,
+            'services': page_obj,
+            'page_obj': page_obj,
         }
         
         return render(request, 'modules/service_builder/services.html', context)
@@ -136,12 +194,15 @@ def services(request):
 def logs(request):
     """Service logs page"""
     try:
-        logs = ServiceLog.objects.all().order_by('-created_at')
+        flush_service_logs()
+        logs = ServiceLog.objects.for_list().order_by('-created_at')
+        page_obj = Paginator(logs, _LOGS_PER_PAGE).get_page(request.GET.get('page'))
         
         context = {
             'page_title': _('Service Logs'),
             'active_module': 'service_builder',
-            'logs': logs,
+            'logs': page_obj,
+            'page_obj': page_obj,
         }
         
         return render(request, 'modules/service_builder/logs.html', context)
@@ -156,13 +217,14 @@ def logs(request):
 def service_detail(request, service_name):
     """Service detail page"""
     try:
-        service = get_object_or_404(ServiceConfiguration, name=service_name)
+        service = ServiceConfiguration.get_cached(service_name)
         
         # Get service status
         status_result = get_service_status(service_name)
         
         # Get recent logs for this service
-        service_logs = ServiceLog.objects.filter(service_name=service_name).order_by('-created_at')[:20]
+        flush_service_logs()
+        service_logs = ServiceLog.objects.for_list().filter(service_name=service_name).order_by('-created_at')[:20]
         
         context = {
             'page_title': _('Service: %(service_name)s') % {'service_name': service_name},
@@ -184,7 +246,7 @@ def service_detail(request, service_name):
 def edit_service(request, service_name):
     """Edit service page"""
     try:
-        service = get_object_or_404(ServiceConfiguration, name=service_name)
+        service = ServiceConfiguration.get_cached(service_name)
         
         # Get system users for dropdown
         system_users = get_system_users()
@@ -212,17 +274,19 @@ def edit_service(request, service_name):
 def service_control(request, service_name, action):
     """Service control actions"""
     try:
-        service = get_object_or_404(ServiceConfiguration, name=service_name)
+        service = ServiceConfiguration.get_cached(service_name)
         
         # Perform service control action
         success, message = control_service(service_name, action)
         
         if success:
             messages.success(request, f"Service {action} successful: {message}")
-            log_service_operation(service_name, action, 'success', message, request.user.username, request.META.get('REMOTE_ADDR'))
+            log_service_operation(service_name, action, 'success', message, request.user.username, request.META.get('REMOTE_ADDR'),
+                                  flush=True)
         else:
             messages.error(request, f"Service {action} failed: {message}")
-            log_service_operation(service_name, action, 'error', message, request.user.username, request.META.get('REMOTE_ADDR'))
+            log_service_operation(service_name, action, 'error', message, request.user.username, request.META.get('REMOTE_ADDR'),
+                                  flush=True)
         
         return redirect('service_builder:service_detail', service_name=service_name)
         
@@ -240,7 +304,7 @@ def api_validate_path(request):
     """Validate application path"""
     try:
         try:
-            data = json.loads(request.body)
+            data = _json_loads(request.body)
         except json.JSONDecodeError as e:
             return JsonResponse({'success': False, 'error': f'Invalid JSON data: {str(e)}'})
         
@@ -282,7 +346,7 @@ def api_suggest_config(request):
     """Suggest service configuration"""
     try:
         try:
-            data = json.loads(request.body)
+            data = _json_loads(request.body)
         except json.JSONDecodeError as e:
             return JsonResponse({'success': False, 'error': f'Invalid JSON data: {str(e)}'})
         
@@ -306,7 +370,7 @@ def api_analyze_python(request):
     """Analyze Python file for configuration"""
     try:
         try:
-            data = json.loads(request.body)
+            data = _json_loads(request.body)
         except json.JSONDecodeError as e:
             return JsonResponse({'success': False, 'error': f'Invalid JSON data: {str(e)}'})
         
@@ -330,30 +394,31 @@ def api_create_service(request):
     try:
         # Parse JSON data safely
         try:
-            data = json.loads(request.body)
+            data = _json_loads(request.body)
         except json.JSONDecodeError as e:
             return JsonResponse({'success': False, 'error': f'Invalid JSON data: {str(e)}'})
         
+        if not isinstance(data, dict):
+            return JsonResponse({'success': False, 'error': 'Invalid JSON data: expected an object'})
+        service_request = CreateServiceRequest.from_dict(data)
+        
         # Validate required fields
-        required_fields = ['name', 'application_path', 'user']
-        for field in required_fields:
-            if not data.get(field):
+        for field in CreateServiceRequest.REQUIRED_FIELDS:
+            if not getattr(service_request, field):
                 return JsonResponse({'success': False, 'error': f'{field} is required'})
         
-        # Create service configuration
-        service_config = ServiceConfiguration.objects.create(
-            name=data['name'],
-            description=data.get('description', ''),
-            service_type=data.get('service_type', 'normal'),
-            application_path=data['application_path'],
-            interpreter=data.get('interpreter', ''),
-            user=data['user'],
-            working_directory=data.get('working_directory', ''),
-            port=data.get('port'),
-            host=data.get('host', '0.0.0.0'),
-            restart_policy=data.get('restart_policy', 'always'),
-            environment_vars=data.get('environment_vars', ''),
-        )
+        if not is_valid_service_name(service_request.name):
+            return JsonResponse({'success': False, 'error': 'name may only contain letters, digits and _ . @ -'})
+        
+        # Create service configuration (uniqueness and port range are enforced by the DB)
+        try:
+            service_config = ServiceConfiguration.objects.create(**asdict(service_request))
+        except IntegrityError as e:
+            logger.warning(f"Service configuration rejected by database constraints: {e}")
+            return JsonResponse(
+                {'success': False, 'error': f"Service '{service_request.name}' already exists or has an invalid port"},
+                status=409
+            )
         
         # Create systemd service
         success, message = create_systemd_service(service_config)
@@ -377,34 +442,52 @@ def api_create_service(request):
 
 
 @require_http_methods(["GET"])
-def api_service_status(request, service_name):
+async def api_service_status(request, service_name):
     """Get service status"""
     try:
-        status_result = get_service_status(service_name)
-        return JsonResponse({'success': True, **status_result})
+        status_result = await aget_service_status(service_name)
+        return _json_response({'success': True, **status_result})
         
     except Exception as e:
         logger.error(f"Error getting service status: {e}")
         return JsonResponse({'success': False, 'error': str(e)})
 
 
+@require_http_methods(["GET"])
+async def api_service_statuses(request):
+    """Get statuses of several services in one call (?names=a,b,c)"""
+    try:
+        names = [
+            name for name in request.GET.get('names', '').split(',')
+            if is_valid_service_name(name)
+        ]
+        if not names:
+            return JsonResponse({'success': False, 'error': 'names is required'})
+        
+        # Tek systemctl çağrısı (veya paralel sorgular) event loop'u bloklamadan pool'da çalışır
+        statuses = await run_blocking(ServiceManager.get_service_statuses, names)
+        return _json_response({'success': True, 'statuses': statuses})
+        
+    except Exception as e:
+        logger.error(f"Error getting service statuses: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
 @require_http_methods(["GET"])
 def api_service_logs(request, service_name):
     """Get service logs"""
     try:
-        logs = ServiceLog.objects.filter(service_name=service_name).order_by('-created_at')[:50]
-        logs_data = []
-        for log in logs:
-            logs_data.append({
-                'action': log.action,
-                'status': log.status,
-                'message': log.message,
-                'user': log.user,
-                'created_at': log.created_at.isoformat(),
-                'details': log.details
-            })
-        
-        return JsonResponse({'success': True, 'logs': logs_data})
+        flush_service_logs()
+        logs = ServiceLog.objects.filter(service_name=service_name).order_by('-created_at').values(
+            'action', 'status', 'message', 'user', 'created_at', 'details'
+        )[:50]
+        logs_data = list(logs)
+        # orjson datetime'ı isoformat() ile aynı biçimde kendisi serileştirir
+        if not ORJSON_AVAILABLE:
+            for log in logs_data:
+                log['created_at'] = log['created_at'].isoformat()
+        
+        return _json_response({'success': True, 'logs': logs_data})
         
     except Exception as e:
         logger.error(f"Error getting service logs: {e}")
@@ -413,8 +496,10 @@ def api_service_logs(request, service_name):
 
 @require_http_methods(["GET"])
 def api_system_users(request):
-    """Get system users"""
+    """Get system users (cached; ?refresh=1 re-reads, staff only)"""
     try:
+        if request.GET.get('refresh') == '1' and request.user.is_staff:
+            get_system_users.cache_clear()
         users = get_system_users()
         return JsonResponse({'success': True, 'users': users})
         
@@ -425,8 +510,10 @@ def api_system_users(request):
 
 @require_http_methods(["GET"])
 def api_network_interfaces(request):
-    """Get network interfaces"""
+    """Get network interfaces (cached; ?refresh=1 re-reads, staff only)"""
     try:
+        if request.GET.get('refresh') == '1' and request.user.is_staff:
+            get_network_interfaces.cache_clear()
         interfaces = get_network_interfaces()
         return JsonResponse({'success': True, 'interfaces': interfaces})
         
@@ -436,8 +523,10 @@ def api_network_interfaces(request):
 
 @csrf_exempt
 def api_service_managers(request):
-    """Get available service managers"""
+    """Get available service managers (?refresh=1 re-probes, staff only)"""
     try:
+        if request.GET.get('refresh') == '1' and request.user.is_staff:
+            refresh_service_manager_cache()
         managers = detect_service_manager()
         primary = get_primary_service_manager()
         return JsonResponse({
@@ -452,6 +541,14 @@ def api_service_managers(request):
             'error': str(e)
         })
 
+
+# Fields api_update_service accepts from the request body
+_UPDATABLE_SERVICE_FIELDS = (
+    'description', 'service_type', 'application_path', 'interpreter', 'user',
+    'working_directory', 'port', 'host', 'restart_policy', 'environment_vars',
+)
+
+
 @csrf_exempt
 @require_http_methods(["PUT"])
 def api_update_service(request, service_name):
@@ -459,7 +556,7 @@ def api_update_service(request, service_name):
     try:
         # Parse JSON data safely
         try:
-            data = json.loads(request.body)
+            data = _json_loads(request.body)
         except json.JSONDecodeError as e:
             return JsonResponse({'success': False, 'error': f'Invalid JSON data: {str(e)}'})
         
@@ -469,20 +566,10 @@ def api_update_service(request, service_name):
         except ServiceConfiguration.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Service not found'})
         
-        # Update service configuration
-        service_config.description = data.get('description', service_config.description)
-        service_config.service_type = data.get('service_type', service_config.service_type)
-        service_config.application_path = data.get('application_path', service_config.application_path)
-        service_config.interpreter = data.get('interpreter', service_config.interpreter)
-        service_config.user = data.get('user', service_config.user)
-        service_config.working_directory = data.get('working_directory', service_config.working_directory)
-        service_config.port = data.get('port', service_config.port)
-        service_config.host = data.get('host', service_config.host)
-        service_config.restart_policy = data.get('restart_policy', service_config.restart_policy)
-        service_config.environment_vars = data.get('environment_vars', service_config.environment_vars)
-        
-        # Save changes
-        service_config.save()
+        # Update service configuration (only changed columns are written)
+        service_config.save_patch(**{
+            field: data[field] for field in _UPDATABLE_SERVICE_FIELDS if field in data
+        })
         
         # Update systemd service
         success, message = update_systemd_service(service_config)
@@ -501,23 +588,24 @@ def api_update_service(request, service_name):
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def api_service_control(request, service_name, action):
-    """Control service via API"""
+async def api_service_control(request, service_name, action):
+    """Control service via API (systemctl runs without blocking the worker)"""
     try:
         # Get service configuration
-        try:
-            service_config = ServiceConfiguration.objects.get(name=service_name)
-        except ServiceConfiguration.DoesNotExist:
+        if not await ServiceConfiguration.objects.filter(name=service_name).aexists():
             return JsonResponse({'success': False, 'error': 'Service not found'})
         
         # Control service
-        success, message = control_service(service_name, action)
+        success, message = await acontrol_service(service_name, action)
         
+        user = await request.auser()
+        # Buffer flush'ı DB'ye yazabileceği için sync context'te çalıştırılır
+        alog_service_operation = sync_to_async(log_service_operation)
         if success:
-            log_service_operation(service_name, action, 'success', message, request.user.username, request.META.get('REMOTE_ADDR'))
+            await alog_service_operation(service_name, action, 'success', message, user.username, request.META.get('REMOTE_ADDR'))
             return JsonResponse({'success': True, 'message': message})
         else:
-            log_service_operation(service_name, action, 'error', message, request.user.username, request.META.get('REMOTE_ADDR'))
+            await alog_service_operation(service_name, action, 'error', message, user.username, request.META.get('REMOTE_ADDR'))
             return JsonResponse({'success': False, 'error': message})
         
     except Exception as e:
@@ -553,44 +641,25 @@ def api_delete_service(request, service_name):
         return JsonResponse({'success': False, 'error': str(e)})
 
 
-# Helper functions
-
-def get_service_status(service_name):
-    """Get service status from systemd"""
-    try:
-        result = subprocess.run(
-            ['sudo', 'systemctl', 'status', f'{service_name}.service'],
-            capture_output=True,
-            text=True
-        )
-        
-        if 'Active: active (running)' in result.stdout:
-            return {'status': 'running', 'message': 'Service is running'}
-        elif 'Active: inactive (dead)' in result.stdout:
-            return {'status': 'stopped', 'message': 'Service is stopped'}
-        else:
-            return {'status': 'unknown', 'message': result.stdout}
-            
-    except Exception as e:
-        return {'status': 'error', 'message': str(e)}
+# Per-service API verbs served by a single URL pattern
+_SERVICE_API_VIEWS = {
+    'status': api_service_status,
+    'logs': api_service_logs,
+    'control': api_service_control,
+    'update': api_update_service,
+    'delete': api_delete_service,
+}
 
 
-def control_service(service_name, action):
-    """Control service (start, stop, restart, enable, disable)"""
-    try:
-        if action in ['start', 'stop', 'restart', 'enable', 'disable']:
-            result = subprocess.run(
-                ['sudo', 'systemctl', action, f'{service_name}.service'],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                return True, f"Service {action} successful"
-            else:
-                return False, f"Service {action} failed: {result.stderr}"
-        else:
-            return False, f"Invalid action: {action}"
-            
-    except Exception as e:
-        return False, f"Error controlling service: {str(e)}"
\ No newline at end of file
+@csrf_exempt
+async def api_service_dispatch(request, service_name, verb, arg=None):
+    """Dispatch api/service/<name>/<verb>/[<arg>/] to the matching view"""
+    handler = _SERVICE_API_VIEWS.get(verb)
+    # Only 'control' takes an argument (the action)
+    if handler is None or (verb == 'control') != bool(arg):
+        return JsonResponse({'success': False, 'error': 'Not found'}, status=404)
+    if not iscoroutinefunction(handler):
+        handler = sync_to_async(handler)
+    if arg:
+        return await handler(request, service_name, arg)
+    return await handler(request, service_name)
@@ -0,0 +1,116 @@
+"""
+Service Monitoring Broadcaster
+One shared polling task per process that fans service updates out to all
+WebSocket clients connected to this process through a channel layer group
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+from channels.layers import get_channel_layer
+from .service_manager import service_manager
+
+# Optional fast JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+GROUP_PREFIX = 'service_monitoring_updates'
+POLL_INTERVAL = 2  # seconds
+
+# Redis channel layer'da gruplar tüm worker process'lerini kapsar; her process kendi
+# poller'ının gönderdiği grubu kullanır, yoksa istemciler her güncellemeyi N kez alır
+_group_name = None
+_group_pid = None
+
+# Bu process'teki abone consumer sayısı ve paylaşılan polling task'ı
+_subscribers = 0
+_broadcast_task = None
+_latest_payload = None
+
+
+def dumps(data):
+    """Serialize a WebSocket message to text (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(',', ':'))
+
+
+def group_name():
+    """Channel layer group of this process's poller (recomputed after fork)"""
+    global _group_name, _group_pid
+    pid = os.getpid()
+    if _group_pid != pid:
+        _group_name = f'{GROUP_PREFIX}.{pid}.{uuid.uuid4().hex}'
+        _group_pid = pid
+    return _group_name
+
+
+def latest_payload():
+    """Last broadcast services_update message, or None before the first poll"""
+    return _latest_payload
+
+
+def subscribe():
+    """Register a consumer; starts the polling task for the first one (call from the event loop)"""
+    global _subscribers, _broadcast_task
+    _subscribers += 1
+    if _broadcast_task is None or _broadcast_task.done():
+        _broadcast_task = asyncio.create_task(_broadcast_loop())
+
+
+def unsubscribe():
+    """Unregister a consumer; stops the polling task when no consumers are left"""
+    global _subscribers, _broadcast_task, _latest_payload
+    _subscribers = max(0, _subscribers - 1)
+    if _subscribers == 0 and _broadcast_task is not None:
+        _broadcast_task.cancel()
+        _broadcast_task = None
+        _latest_payload = None
+
+
+async def _broadcast_loop():
+    """
+    Main monitoring loop
+    Polls services every 2 seconds and broadcasts only when they change
+    """
+    global _latest_payload
+    channel_layer = get_channel_layer()
+    last_services_digest = None
+
+    try:
+        while True:
+            try:
+                services_data = await service_manager.aget_services()
+                # Tek serileştirme: gönderilecek payload hem karşılaştırılır hem gönderilir
+                payload = dumps({
+                    'type': 'services_update',
+                    'services': services_data
+                })
+                services_digest = hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+                # Send only if there are changes
+                if services_digest != last_services_digest:
+                    _latest_payload = payload
+                    await channel_layer.group_send(group_name(), {
+                        'type': 'services.update',
+                        'payload': payload
+                    })
+                    last_services_digest = services_digest
+
+            except Exception as e:
+                logger.error(f"Error in Service Monitoring broadcast loop: {str(e)}")
+
+            # Wait 2 seconds
+            await asyncio.sleep(POLL_INTERVAL)
+
+    except asyncio.CancelledError:
+        logger.info("Service Monitoring broadcast loop cancelled")
+        raise
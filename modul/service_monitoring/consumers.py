@@ -4,11 +4,12 @@ Real-time service status updates via WebSocket
 """
 
 import json
-import asyncio
 import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from .service_manager import ServiceManager
+from . import broadcaster
+from .broadcaster import dumps as _dumps
+from .service_manager import service_manager
 
 logger = logging.getLogger(__name__)
 
@@ -16,14 +17,14 @@ logger = logging.getLogger(__name__)
 class ServiceMonitoringConsumer(AsyncWebsocketConsumer):
     """
     Service Monitoring WebSocket Consumer
-    Each client has its own monitoring task
+    All clients share one monitoring task (see broadcaster) via a group
     """
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.monitoring_task = None
         self.is_monitoring = False
-        self.service_manager = ServiceManager()
+        # Paylaşılan instance: cache ve view'lardaki kontrol işlemlerinin invalidation'ı ortak
+        self.service_manager = service_manager
         
     async def connect(self):
         """WebSocket connection established"""
@@ -35,22 +36,25 @@ class ServiceMonitoringConsumer(AsyncWebsocketConsumer):
         await self.accept()
         logger.info(f"Service Monitoring WebSocket connected: {self.scope['user'].username}")
         
-        # Start monitoring task
+        # Join the shared monitoring broadcast
+        await self.channel_layer.group_add(broadcaster.group_name(), self.channel_name)
         self.is_monitoring = True
-        self.monitoring_task = asyncio.create_task(self.monitor_loop())
+        broadcaster.subscribe()
+        
+        # Send the latest known state right away (the first poll sends it otherwise)
+        payload = broadcaster.latest_payload()
+        if payload is not None:
+            await self.send(text_data=payload)
         
     async def disconnect(self, close_code):
         """WebSocket connection closed"""
         logger.info(f"Service Monitoring WebSocket disconnected: {close_code}")
         
-        # Stop monitoring task
-        self.is_monitoring = False
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
-            try:
-                await self.monitoring_task
-            except asyncio.CancelledError:
-                pass
+        # Leave the shared monitoring broadcast
+        if self.is_monitoring:
+            self.is_monitoring = False
+            broadcaster.unsubscribe()
+            await self.channel_layer.group_discard(broadcaster.group_name(), self.channel_name)
     
     async def receive(self, text_data):
         """Message received from client"""
@@ -78,44 +82,14 @@ class ServiceMonitoringConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.error(f"Error in Service Monitoring receive: {str(e)}")
     
-    async def monitor_loop(self):
-        """
-        Main monitoring loop
-        Checks for changes every 2 seconds
-        """
-        last_services_hash = None
-        
-        try:
-            while self.is_monitoring:
-                try:
-                    # Check services
-                    services_data = await self.get_services_data()
-                    services_hash = hash(str(services_data))
-                    
-                    # Send only if there are changes
-                    if services_hash != last_services_hash:
-                        await self.send(text_data=json.dumps({
-                            'type': 'services_update',
-                            'services': services_data
-                        }))
-                        last_services_hash = services_hash
-                    
-                    # Wait 2 seconds
-                    await asyncio.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error in Service Monitoring loop: {str(e)}")
-                    await asyncio.sleep(2)
-                    
-        except asyncio.CancelledError:
-            logger.info("Service Monitoring loop cancelled")
-            raise
+    async def services_update(self, event):
+        """Forward a services update broadcast by the shared monitoring task"""
+        await self.send(text_data=event['payload'])
     
-    @database_sync_to_async
-    def get_services_data(self):
-        """Get services data (sync -> async)"""
+    async def get_services_data(self):
+        """Get services data (asyncio subprocesses, no worker thread)"""
         try:
-            services = self.service_manager.get_services()
+            services = await self.service_manager.aget_services()
             return services
         except Exception as e:
             logger.error(f"Error getting services: {str(e)}")
@@ -124,7 +98,7 @@ class ServiceMonitoringConsumer(AsyncWebsocketConsumer):
     async def send_services_update(self):
         """Send services update"""
         services_data = await self.get_services_data()
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=_dumps({
             'type': 'services_update',
             'services': services_data
         }))
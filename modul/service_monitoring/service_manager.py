@@ -1,25 +1,52 @@
 import os
+import asyncio
 import subprocess
 import platform
 import re
 import json
 import shutil
-import shlex
-from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import logging
+import threading
+import time
+from concurrent.futures import Future
 
 logger = logging.getLogger(__name__)
 
+LIST_UNIT_FILES_COMMAND = ["systemctl", "list-unit-files", "--type=service", "--all", "--no-pager"]
+
+# Batched `systemctl show` (tek süreçte çok sayıda unit)
+SHOW_PROPERTIES = ",".join((
+    "Id", "Names", "ActiveState", "SubState", "UnitFileState", "Description",
+    "MainPID", "MemoryCurrent", "CPUUsageNSec", "ActiveEnterTimestampMonotonic",
+))
+SHOW_BATCH_SIZE = 200  # units per call, keeps argv well below ARG_MAX
+PROPERTY_PATTERN = re.compile(r"^(\w+)=(.*)$", re.M)
+
+# `systemctl list-unit-files` / `systemctl status` çıktı desenleri
+UNIT_FILE_PATTERN = re.compile(r"^([\w\-@\.]+)\.service\s+(\w+)")
+DESCRIPTION_PATTERN = re.compile(r"Description:\s*(.+)")
+MAIN_PID_PATTERN = re.compile(r"Main PID:\s*(\d+)")
+ACTIVE_UPTIME_PATTERN = re.compile(r"Active:\s*active\s*\((.+)\)")
+
+# `systemctl is-enabled` bu durumlarda 0 döner
+ENABLED_FILE_STATES = frozenset({
+    "enabled", "enabled-runtime", "static", "alias", "indirect", "generated", "transient",
+})
+UNSET_U64 = 2 ** 64 - 1  # systemd'nin "[not set]" değeri
+TOTAL_MEMORY = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
 class ServiceManager:
     """Advanced service management class - works on all Linux distributions"""
     
     def __init__(self):
         self.system = platform.system().lower()
         self.distro = self._detect_distro()
-        self.services_cache = {}
-        self.last_update = None
         self.CACHE_TIMEOUT = 30  # 30 seconds cache
+        # (expires_at monotonic, services) ve devam eden yenileme; ikisi de _cache_lock ile korunur
+        self._services_cache = None
+        self._services_refresh = None
+        self._cache_lock = threading.Lock()
         
     def _detect_distro(self) -> str:
         """Detect Linux distribution"""
@@ -41,24 +68,23 @@ class ServiceManager:
             pass
         return 'unknown'
     
-    def _run_command(self, command: str, timeout: int = 30) -> Tuple[bool, str, str]:
+    def _resolve_command(self, command: List[str]) -> Optional[List[str]]:
+        """Command with the executable replaced by its full path (prevents PATH hijacking); None if not found"""
+        executable = shutil.which(command[0])
+        if not executable:
+            logger.warning(f"Executable not found in PATH: {command[0]}")
+            return None
+        return [executable, *command[1:]]
+    
+    def _run_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
         """
         Safe command execution - prevents shell injection
-        Uses shlex.split() to safely parse command string and shell=False for security
+        The command is an argv list run with shell=False; no shell parsing at any point
         """
         try:
-            # Parse command string safely to prevent shell injection
-            # shlex.split() properly handles quoted arguments and escapes special characters
-            command_list = shlex.split(command)
-            
-            # Find full path to executable to prevent PATH hijacking
-            executable = shutil.which(command_list[0])
-            if not executable:
-                logger.warning(f"Executable not found in PATH: {command_list[0]}")
-                return False, "", f"Executable not found: {command_list[0]}"
-            
-            # Replace first element with full path
-            command_list[0] = executable
+            command_list = self._resolve_command(command)
+            if command_list is None:
+                return False, "", f"Executable not found: {command[0]}"
             
             # Run with shell=False for security - prevents shell injection
             result = subprocess.run(
@@ -72,12 +98,35 @@ class ServiceManager:
             return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
         except subprocess.TimeoutExpired:
             return False, "", "Command timed out"
-        except ValueError as e:
-            # Invalid command format
-            logger.error(f"Invalid command format: {command} - {e}")
-            return False, "", f"Invalid command format: {str(e)}"
         except Exception as e:
-            logger.error(f"Command execution error: {command} - {e}")
+            logger.error(f"Command execution error: {' '.join(command)} - {e}")
+            return False, "", str(e)
+    
+    async def _arun_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
+        """Async _run_command: asyncio subprocess on the event loop, no worker thread is held"""
+        try:
+            command_list = self._resolve_command(command)
+            if command_list is None:
+                return False, "", f"Executable not found: {command[0]}"
+            
+            process = await asyncio.create_subprocess_exec(
+                *command_list,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return False, "", "Command timed out"
+            return (
+                process.returncode == 0,
+                stdout.decode(errors='replace').strip(),
+                stderr.decode(errors='replace').strip()
+            )
+        except Exception as e:
+            logger.error(f"Command execution error: {' '.join(command)} - {e}")
             return False, "", str(e)
     
     def _detect_service_category(self, name: str, description: str = "") -> str:
@@ -105,70 +154,211 @@ class ServiceManager:
         
         return 'Other'
     
+    def _begin_refresh(self, force_refresh: bool):
+        """(cached services, None, False) on a cache hit, else (None, refresh future, owns the refresh)"""
+        with self._cache_lock:
+            # Cache check
+            if (not force_refresh and
+                    self._services_cache and
+                    time.monotonic() < self._services_cache[0] and
+                    self._services_cache[1]):
+                return self._services_cache[1], None, False
+            
+            # Devam eden bir yenileme varsa onun sonucunu bekle (single-flight)
+            if self._services_refresh is not None:
+                return None, self._services_refresh, False
+            self._services_refresh = Future()
+            return None, self._services_refresh, True
+    
+    def _end_refresh(self, refresh: Future, services: Optional[List[Dict]] = None, error: Optional[Exception] = None):
+        """Publish a refresh result to waiters and the cache"""
+        # Update cache (araya bir invalidation girdiyse bu sonuç cache'e yazılmaz)
+        with self._cache_lock:
+            if self._services_refresh is refresh:
+                self._services_refresh = None
+                if error is None:
+                    self._services_cache = (time.monotonic() + self.CACHE_TIMEOUT, services)
+        if error is None:
+            refresh.set_result(services)
+        else:
+            refresh.set_exception(error)
+    
+    def _abandon_refresh(self, refresh: Future):
+        """Owner was cancelled/interrupted: cancel the refresh so waiters retry instead of inheriting it"""
+        with self._cache_lock:
+            if self._services_refresh is refresh:
+                self._services_refresh = None
+        refresh.cancel()
+    
     def get_services(self, force_refresh: bool = False) -> List[Dict]:
-        """Get all services - optimized with cache"""
-        current_time = datetime.now()
-        
-        # Cache check
-        if (not force_refresh and 
-            self.last_update and 
-            (current_time - self.last_update).seconds < self.CACHE_TIMEOUT and 
-            self.services_cache):
-            return self.services_cache
+        """Get all services - optimized with cache, concurrent refreshes share one scan"""
+        while True:
+            cached, refresh, owner = self._begin_refresh(force_refresh)
+            if cached is not None:
+                return cached
+            if owner:
+                break
+            # Yenileme süresi _run_command timeout'larıyla sınırlı
+            try:
+                return refresh.result()
+            except Exception:
+                # Sahibi iptal edildiyse yenilemeyi yeniden dene (gerekirse bu çağıran üstlenir)
+                if not refresh.cancelled():
+                    raise
         
-        services = []
+        try:
+            services = self._get_systemd_services() if self.system == "linux" else []
+        except Exception as e:
+            self._end_refresh(refresh, error=e)
+            raise
+        except BaseException:
+            self._abandon_refresh(refresh)
+            raise
+        self._end_refresh(refresh, services)
         
-        if self.system == "linux":
-            services.extend(self._get_systemd_services())
+        return services
+    
+    async def aget_services(self, force_refresh: bool = False) -> List[Dict]:
+        """Async get_services (WebSocket path); shares the cache and in-flight refresh with it"""
+        while True:
+            cached, refresh, owner = self._begin_refresh(force_refresh)
+            if cached is not None:
+                return cached
+            if owner:
+                break
+            await self._wait_refresh(refresh)
+            if not refresh.cancelled():
+                return refresh.result()
         
-        # Update cache
-        self.services_cache = services
-        self.last_update = current_time
+        try:
+            services = await self._aget_systemd_services() if self.system == "linux" else []
+        except Exception as e:
+            self._end_refresh(refresh, error=e)
+            raise
+        except BaseException:
+            # asyncio.CancelledError dahil: iptal başka çağıranlara aktarılmaz
+            self._abandon_refresh(refresh)
+            raise
+        self._end_refresh(refresh, services)
         
         return services
     
+    async def _wait_refresh(self, refresh: Future):
+        """Wait for a refresh to finish; cancelling the waiter does not cancel the shared refresh"""
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+        
+        def notify(_refresh):
+            loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(None))
+        
+        refresh.add_done_callback(notify)
+        await finished
+    
+    def _invalidate_cache(self):
+        """Drop cached services; a refresh already running won't repopulate the cache"""
+        with self._cache_lock:
+            self._services_cache = None
+            self._services_refresh = None
+    
     def _get_systemd_services(self) -> List[Dict]:
         """List systemd services"""
-        services = []
-        
         try:
             # List all services
-            success, output, error = self._run_command(
-                "systemctl list-unit-files --type=service --all --no-pager"
-            )
+            success, output, error = self._run_command(LIST_UNIT_FILES_COMMAND)
             
             if not success:
                 logger.error(f"Could not get service list: {error}")
-                return services
+                return []
             
-            for line in output.split("\n"):
-                # Parse service name and status
-                match = re.match(r"^([\w\-@\.]+)\.service\s+(\w+)", line)
-                if not match:
-                    continue
-                
-                name = match.group(1)
-                enabled_status = match.group(2)
-                
-                # Get service details
-                service_info = self._get_service_info(name)
-                service_info.update({
-                    "name": name,
-                    "enabled": enabled_status.lower() == "enabled",
-                    "category": self._detect_service_category(name, service_info.get("description", "")),
-                    "type": "systemd"
-                })
-                
-                services.append(service_info)
+            unit_files = self._parse_unit_files(output)
+            
+            # Tüm servislerin detayları toplu `systemctl show` çağrılarıyla alınır
+            properties = {}
+            for command in self._show_commands(unit_files):
+                self._parse_show_output(self._run_command(command), properties)
             
-            return services
+            return self._build_services(unit_files, properties)
             
         except Exception as e:
             logger.error(f"Error getting systemd services: {e}")
-            return services
+            return []
     
-    def _get_service_info(self, name: str) -> Dict:
-        """Get detailed information for a single service"""
+    async def _aget_systemd_services(self) -> List[Dict]:
+        """Async _get_systemd_services; the `systemctl show` batches run concurrently"""
+        try:
+            # List all services
+            success, output, error = await self._arun_command(LIST_UNIT_FILES_COMMAND)
+            
+            if not success:
+                logger.error(f"Could not get service list: {error}")
+                return []
+            
+            unit_files = self._parse_unit_files(output)
+            
+            properties = {}
+            results = await asyncio.gather(*(
+                self._arun_command(command) for command in self._show_commands(unit_files)
+            ))
+            for result in results:
+                self._parse_show_output(result, properties)
+            
+            return self._build_services(unit_files, properties)
+            
+        except Exception as e:
+            logger.error(f"Error getting systemd services: {e}")
+            return []
+    
+    def _parse_unit_files(self, output: str) -> List[Tuple[str, str]]:
+        """(name, enabled status) pairs from `systemctl list-unit-files` output"""
+        unit_files = []
+        for line in output.split("\n"):
+            # Parse service name and status
+            match = UNIT_FILE_PATTERN.match(line)
+            if match:
+                unit_files.append((match.group(1), match.group(2)))
+        return unit_files
+    
+    def _show_commands(self, unit_files: List[Tuple[str, str]]) -> List[List[str]]:
+        """Batched `systemctl show` commands covering the given unit files"""
+        # Template unit'ler (getty@) show ile sorgulanamaz; tüm çağrıyı bozmasınlar
+        unit_names = [f"{name}.service" for name, _ in unit_files if not name.endswith('@')]
+        return [
+            ["systemctl", "show", "--no-pager", f"--property={SHOW_PROPERTIES}",
+             *unit_names[i:i + SHOW_BATCH_SIZE]]
+            for i in range(0, len(unit_names), SHOW_BATCH_SIZE)
+        ]
+    
+    def _parse_show_output(self, result: Tuple[bool, str, str], units: Dict[str, Dict[str, str]]):
+        """Add `systemctl show` records to units: unit name (and aliases) -> {property: value}"""
+        success, output, error = result
+        if not success and not output:
+            logger.error(f"Could not get service properties: {error}")
+            return
+        
+        # Her unit bir kayıt; kayıtlar boş satırla ayrılır
+        for record in output.split("\n\n"):
+            props = dict(PROPERTY_PATTERN.findall(record))
+            for unit_name in props.get("Names", "").split() + [props.get("Id", "")]:
+                if unit_name:
+                    units[unit_name] = props
+    
+    def _build_services(self, unit_files: List[Tuple[str, str]], properties: Dict[str, Dict[str, str]]) -> List[Dict]:
+        """Service entries for the unit files from their `systemctl show` properties"""
+        services = []
+        for name, enabled_status in unit_files:
+            # Get service details
+            service_info = self._service_info_from_properties(properties.get(f"{name}.service"))
+            service_info.update({
+                "name": name,
+                "enabled": enabled_status.lower() == "enabled",
+                "category": self._detect_service_category(name, service_info.get("description", "")),
+                "type": "systemd"
+            })
+            services.append(service_info)
+        return services
+    
+    def _service_info_from_properties(self, props: Optional[Dict[str, str]]) -> Dict:
+        """Build service info from `systemctl show` properties"""
         info = {
             "status": "inactive",
             "description": "",
@@ -180,60 +370,50 @@ class ServiceManager:
             "pid": None
         }
         
+        if not props:
+            return info
+        
         try:
             # Service status
-            success, status_output, _ = self._run_command(f"systemctl is-active {name}")
-            if success and status_output == "active":
+            if props.get("ActiveState") == "active":
                 info["status"] = "active"
                 info["active"] = True
+                # `systemctl status` çıktısındaki "active (running)" parantez içi
+                info["uptime"] = props.get("SubState", "")
             
-            # Is service loaded
-            success, loaded_output, _ = self._run_command(f"systemctl is-enabled {name}")
-            if success:
-                info["loaded"] = True
+            # Is service loaded (is-enabled'ın başarılı döndüğü durumlar)
+            info["loaded"] = props.get("UnitFileState") in ENABLED_FILE_STATES
             
-            # Detailed status information
-            success, detailed_output, _ = self._run_command(f"systemctl status {name} --no-pager")
-            if success:
-                # Description
-                desc_match = re.search(r"Description:\s*(.+)", detailed_output)
-                if desc_match:
-                    info["description"] = desc_match.group(1).strip()
-                
-                # PID
-                pid_match = re.search(r"Main PID:\s*(\d+)", detailed_output)
-                if pid_match:
-                    info["pid"] = int(pid_match.group(1))
-                
-                # Uptime
-                uptime_match = re.search(r"Active:\s*active\s*\((.+)\)", detailed_output)
-                if uptime_match:
-                    info["uptime"] = uptime_match.group(1).strip()
+            info["description"] = props.get("Description", "")
+            
+            # PID
+            main_pid = int(props.get("MainPID") or 0)
+            if main_pid:
+                info["pid"] = main_pid
             
-            # Resource usage (if active)
+            # Resource usage (if active) - cgroup muhasebesinden, ps çağrısı olmadan
             if info["active"] and info["pid"]:
-                self._get_resource_usage(info["pid"], info)
+                self._resource_usage_from_properties(props, info)
             
         except Exception as e:
-            logger.error(f"Error getting service info ({name}): {e}")
+            logger.error(f"Error getting service info ({props.get('Id')}): {e}")
         
         return info
     
-    def _get_resource_usage(self, pid: int, info: Dict):
-        """Get resource usage for PID"""
-        try:
-            # Memory usage
-            success, mem_output, _ = self._run_command(f"ps -p {pid} -o %mem --no-headers")
-            if success and mem_output:
-                info["memory_usage"] = mem_output.strip()
-            
-            # CPU usage
-            success, cpu_output, _ = self._run_command(f"ps -p {pid} -o %cpu --no-headers")
-            if success and cpu_output:
-                info["cpu_usage"] = cpu_output.strip()
-                
-        except Exception as e:
-            logger.error(f"Error getting resource usage (PID {pid}): {e}")
+    def _resource_usage_from_properties(self, props: Dict[str, str], info: Dict):
+        """Memory/CPU percentages (ps %mem/%cpu equivalents) from cgroup accounting properties"""
+        # Memory usage
+        memory = props.get("MemoryCurrent", "")
+        if memory.isdigit() and int(memory) != UNSET_U64:
+            info["memory_usage"] = f"{int(memory) * 100 / TOTAL_MEMORY:.1f}"
+        
+        # CPU usage: ps gibi, başlangıçtan beri ortalama
+        cpu_nsec = props.get("CPUUsageNSec", "")
+        started_usec = props.get("ActiveEnterTimestampMonotonic", "")
+        if cpu_nsec.isdigit() and int(cpu_nsec) != UNSET_U64 and started_usec.isdigit():
+            elapsed_nsec = time.monotonic_ns() - int(started_usec) * 1000
+            if elapsed_nsec > 0:
+                info["cpu_usage"] = f"{int(cpu_nsec) * 100 / elapsed_nsec:.1f}"
     
     def control_service(self, name: str, action: str) -> Tuple[bool, str]:
         """Service control - safe"""
@@ -244,13 +424,12 @@ class ServiceManager:
         
         try:
             # Run with sudo
-            command = f"sudo systemctl {action} {name}"
+            command = ["sudo", "systemctl", action, name]
             success, output, error = self._run_command(command, timeout=60)
             
             if success:
                 # Clear cache
-                self.last_update = None
-                self.services_cache = {}
+                self._invalidate_cache()
                 
                 action_texts = {
                     'start': 'started',
@@ -278,7 +457,7 @@ class ServiceManager:
             self.control_service(name, 'disable')
             
             # Servis dosyasını bul ve sil (pipe kullanmadan güvenli şekilde)
-            success, unit_output, _ = self._run_command(f"systemctl show -p FragmentPath {name}")
+            success, unit_output, _ = self._run_command(["systemctl", "show", "-p", "FragmentPath", name])
             
             if not success or not unit_output:
                 return False, f"Servis dosyası bulunamadı: {name}"
@@ -294,16 +473,15 @@ class ServiceManager:
                 return False, f"Servis dosyası bulunamadı: {name}"
             
             # Dosyayı sil
-            success, output, error = self._run_command(f"sudo rm {unit_file}")
+            success, output, error = self._run_command(["sudo", "rm", unit_file])
             if not success:
                 return False, f"Dosya silinemedi: {error}"
             
             # Systemd'yi yenile
-            self._run_command("sudo systemctl daemon-reload")
+            self._run_command(["sudo", "systemctl", "daemon-reload"])
             
             # Cache'i temizle
-            self.last_update = None
-            self.services_cache = {}
+            self._invalidate_cache()
             
             return True, f"{name} servisi başarıyla silindi"
             
@@ -314,7 +492,7 @@ class ServiceManager:
     def get_service_logs(self, name: str, lines: int = 50) -> List[str]:
         """Servis loglarını al"""
         try:
-            success, output, error = self._run_command(f"journalctl -u {name} -n {lines} --no-pager")
+            success, output, error = self._run_command(["journalctl", "-u", name, "-n", str(lines), "--no-pager"])
             if success:
                 return output.split('\n')
             return []
@@ -343,41 +521,41 @@ class ServiceManager:
             }
             
             # Temel durum
-            success, status, _ = self._run_command(f"systemctl is-active {name}")
+            success, status, _ = self._run_command(["systemctl", "is-active", name])
             if success and status == "active":
                 details["active"] = True
                 details["status"] = "active"
             
-            success, enabled, _ = self._run_command(f"systemctl is-enabled {name}")
+            success, enabled, _ = self._run_command(["systemctl", "is-enabled", name])
             if success:
                 details["enabled"] = enabled == "enabled"
                 details["loaded"] = True
             
             # Detaylı durum
-            success, status_output, _ = self._run_command(f"systemctl status {name} --no-pager")
+            success, status_output, _ = self._run_command(["systemctl", "status", name, "--no-pager"])
             if success:
                 # Açıklama
-                desc_match = re.search(r"Description:\s*(.+)", status_output)
+                desc_match = DESCRIPTION_PATTERN.search(status_output)
                 if desc_match:
                     details["description"] = desc_match.group(1).strip()
                 
                 # PID
-                pid_match = re.search(r"Main PID:\s*(\d+)", status_output)
+                pid_match = MAIN_PID_PATTERN.search(status_output)
                 if pid_match:
                     details["pid"] = int(pid_match.group(1))
                 
                 # Uptime
-                uptime_match = re.search(r"Active:\s*active\s*\((.+)\)", status_output)
+                uptime_match = ACTIVE_UPTIME_PATTERN.search(status_output)
                 if uptime_match:
                     details["uptime"] = uptime_match.group(1).strip()
             
             # Unit file
-            success, unit_content, _ = self._run_command(f"systemctl cat {name}")
+            success, unit_content, _ = self._run_command(["systemctl", "cat", name])
             if success:
                 details["unit_file"] = unit_content
             
             # Dependencies
-            success, deps_output, _ = self._run_command(f"systemctl list-dependencies {name} --no-pager")
+            success, deps_output, _ = self._run_command(["systemctl", "list-dependencies", name, "--no-pager"])
             if success:
                 details["dependencies"] = [
                     dep.strip('└─ ').strip('├─ ').strip()
@@ -386,7 +564,7 @@ class ServiceManager:
                 ]
             
             # Properties
-            success, props_output, _ = self._run_command(f"systemctl show {name}")
+            success, props_output, _ = self._run_command(["systemctl", "show", name])
             if success:
                 for line in props_output.split('\n'):
                     if '=' in line:
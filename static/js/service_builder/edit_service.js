@@ -126,7 +126,7 @@ window.EditService = {
         
         ServiceBuilder.utils.showLoading(document.querySelector('#editServiceForm button[type="submit"]'));
         
-        ServiceBuilder.utils.apiRequest(`update-service/${this.serviceName}/`, {
+        ServiceBuilder.utils.apiRequest(`service/${this.serviceName}/update/`, {
             method: 'PUT',
             body: JSON.stringify(serviceData)
         })
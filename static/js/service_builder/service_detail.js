@@ -80,7 +80,7 @@ window.ServiceDetail = {
             messageElement.textContent = 'Checking service status...';
         }
         
-        ServiceBuilder.utils.apiRequest(`service-status/${this.serviceName}/`)
+        ServiceBuilder.utils.apiRequest(`service/${this.serviceName}/status/`)
             .then(response => {
                 this.updateServiceStatus(response);
             })
@@ -119,7 +119,7 @@ window.ServiceDetail = {
             </div>
         `;
         
-        ServiceBuilder.utils.apiRequest(`service-logs/${this.serviceName}/`)
+        ServiceBuilder.utils.apiRequest(`service/${this.serviceName}/logs/`)
             .then(response => {
                 this.displayServiceLogs(response.logs);
             })
@@ -209,7 +209,7 @@ window.deleteService = function(serviceName) {
     
     ServiceBuilder.utils.showNotification(`Deleting service "${serviceName}"...`, 'info');
     
-    ServiceBuilder.utils.apiRequest(`delete-service/${serviceName}/`, {
+    ServiceBuilder.utils.apiRequest(`service/${serviceName}/delete/`, {
         method: 'DELETE'
     })
     .then(response => {
@@ -28,17 +28,38 @@ window.Services = {
         });
     },
     
-    // Load service statuses
+    // Load service statuses (single batched request for all visible services)
     loadServiceStatuses: function() {
-        const statusElements = document.querySelectorAll('[id^="status-"]');
+        const statusElements = Array.from(document.querySelectorAll('[id^="status-"]'))
+            // Only check if not already checking
+            .filter(element => !element.classList.contains('checking'));
+        if (statusElements.length === 0) return;
         
+        const serviceNames = statusElements.map(element => element.id.replace('status-', ''));
         statusElements.forEach(element => {
-            const serviceName = element.id.replace('status-', '');
-            // Only check if not already checking
-            if (!element.classList.contains('checking')) {
-                this.getServiceStatus(serviceName);
-            }
+            element.classList.add('checking');
+            element.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Checking...';
         });
+        
+        ServiceBuilder.utils.apiRequest(`service-statuses/?names=${encodeURIComponent(serviceNames.join(','))}`)
+            .then(response => {
+                const statuses = response.statuses || {};
+                serviceNames.forEach(serviceName => {
+                    this.updateServiceStatus(
+                        serviceName,
+                        statuses[serviceName] || { status: 'unknown', message: 'Unknown' }
+                    );
+                });
+            })
+            .catch(error => {
+                console.error('Error getting service statuses:', error);
+                serviceNames.forEach(serviceName => {
+                    this.updateServiceStatus(serviceName, { status: 'error', message: 'Status check failed' });
+                });
+            })
+            .finally(() => {
+                statusElements.forEach(element => element.classList.remove('checking'));
+            });
     },
     
     // Get service status
@@ -50,7 +71,7 @@ window.Services = {
         statusElement.classList.add('checking');
         statusElement.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Checking...';
         
-        ServiceBuilder.utils.apiRequest(`service-status/${serviceName}/`)
+        ServiceBuilder.utils.apiRequest(`service/${serviceName}/status/`)
             .then(response => {
                 this.updateServiceStatus(serviceName, response);
             })
@@ -143,7 +164,7 @@ window.deleteService = function(serviceName) {
         ServiceBuilder.utils.showLoading(deleteButton);
     }
     
-    ServiceBuilder.utils.apiRequest(`delete-service/${serviceName}/`, {
+    ServiceBuilder.utils.apiRequest(`service/${serviceName}/delete/`, {
         method: 'DELETE'
     })
     .then(response => {